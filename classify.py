@@ -2,13 +2,19 @@
 classify.py
 Map-reduce helpers for the local-model intel report pipeline.
 
-Pipeline:
-  1. parse_posts_from_markdown()   - extract posts from summary .md
-  2. classify_post()               - assign each post to a category (1 model call)
-  3. select_top_per_category()     - pick top N by engagement per category
+Pipeline (posts arrive as the structured dicts produced by the fetchers):
+  1. classify_embeddings.classify_posts_embedding()
+                                   - embed the posts and assign each one to the category
+                                     anchor it is most similar to
+  2. select_top_per_category()     - pick top N by engagement per category
+
+CATEGORIES is shared with classify_embeddings. classify_post() and classify_batch()
+remain as prompt-based alternatives that ask a generative model for each post's category.
 """
 
+import heapq
 import re
+from collections import defaultdict
 from typing import Callable
 
 CATEGORIES = [
@@ -20,6 +26,15 @@ CATEGORIES = [
     "Society & Culture",
 ]
 
+_VALID_CATEGORIES = frozenset(CATEGORIES)
+
+# Lowercased names and keywords are built once; _match_category runs for every post.
+_CAT_LOWERS = [(cat, cat.lower()) for cat in CATEGORIES]
+_CAT_WORDS = [
+    (cat, tuple(w for w in cat.lower().split() if w not in ("&", "and")))
+    for cat in CATEGORIES
+]
+
 CATEGORY_PROMPT = f"""Classify the following social media post into exactly ONE of these categories:
 {chr(10).join(f'- {c}' for c in CATEGORIES)}
 
@@ -38,6 +53,11 @@ Respond with a simple numbered list in the format:
 
 POSTS:
 """
+
+# Matches each "N. Category" / "N) Category" line of a batch response.
+_NUMBERED_LINE_RE = re.compile(r"^[ \t]*(\d+)[.)][ \t]*(.*)$", re.MULTILINE)
+
+
 def classify_batch(texts: list[str], call_fn: Callable[[str], str]) -> list[str | None]:
     """
     Classify a batch of up to 10 posts in a single model call.
@@ -55,16 +75,13 @@ def classify_batch(texts: list[str], call_fn: Callable[[str], str]) -> list[str
     results: list[str | None] = [None] * len(texts)
 
     # Parse numbered list: 1. Category, 2. Category...
-    # We look for lines starting with "N." or "N)"
-    lines = response.splitlines()
-    for line in lines:
-        match = re.search(r"^(\d+)[.)]\s*(.*)", line.strip())
-        if match:
-            idx = int(match.group(1)) - 1
-            if 0 <= idx < len(texts):
-                raw_cat = match.group(2).strip()
-                # Use the same matching logic as single classification
-                results[idx] = _match_category(raw_cat)
+    # A multiline pattern scans the whole response without materialising a list of lines.
+    for match in _NUMBERED_LINE_RE.finditer(response):
+        idx = int(match.group(1)) - 1
+        if 0 <= idx < len(texts):
+            raw_cat = match.group(2).strip()
+            # Use the same matching logic as single classification
+            results[idx] = _match_category(raw_cat)
 
     return results
 
@@ -73,12 +90,11 @@ def _match_category(raw_cat: str) -> str | None:
     """Helper to match a raw model response to a valid category name."""
     raw_cat = raw_cat.lower()
     # First: try exact match
-    for cat in CATEGORIES:
-        if cat.lower() in raw_cat:
+    for cat, cat_lower in _CAT_LOWERS:
+        if cat_lower in raw_cat:
             return cat
     # Second: try keyword match
-    for cat in CATEGORIES:
-        words = [w for w in cat.lower().split() if w not in ("&", "and")]
+    for cat, words in _CAT_WORDS:
         if any(w in raw_cat for w in words):
             return cat
     return None
@@ -93,6 +109,10 @@ def classify_post(text: str, call_fn: Callable[[str], str]) -> str | None:
     return _match_category(response)
 
 
+def _engagement_key(post: dict) -> int:
+    return post.get("engagement_score", 0)
+
+
 def select_top_per_category(
     posts: list[dict],
     top_n: int = 10,
@@ -105,17 +125,16 @@ def select_top_per_category(
     Returns:
         {category_name: [top_n posts sorted by engagement desc]}
     """
-    grouped: dict[str, list[dict]] = {cat: [] for cat in CATEGORIES}
-
+    grouped: defaultdict[str, list[dict]] = defaultdict(list)
     for post in posts:
         cat = post.get("category")
-        if cat not in grouped:
-            continue  # skip posts without a valid category
-        grouped[cat].append(post)
+        if cat in _VALID_CATEGORIES:  # skip posts without a valid category
+            grouped[cat].append(post)
 
-    # Sort each group by engagement and take top N
+    # Take the top N of each group by engagement; nlargest avoids sorting the whole group.
+    # Iterating CATEGORIES keeps report sections in canonical order and omits empty ones.
     return {
-        cat: sorted(posts_in_cat, key=lambda p: p.get("engagement_score", 0), reverse=True)[:top_n]
-        for cat, posts_in_cat in grouped.items()
-        if posts_in_cat  # omit empty categories
+        cat: heapq.nlargest(top_n, grouped[cat], key=_engagement_key)
+        for cat in CATEGORIES
+        if cat in grouped
     }
@@ -3,7 +3,23 @@ fetchers/base.py
 Abstract base class that all platform fetchers must implement.
 """
 
+import sys
 from abc import ABC, abstractmethod
+from datetime import datetime
+
+try:
+    # Optional C parser, several times faster than fromisoformat; accepts the trailing "Z" natively.
+    from ciso8601 import parse_datetime as parse_iso_datetime
+except ImportError:
+    if sys.version_info >= (3, 11):
+        # Python 3.11+ parses the trailing "Z" natively.
+        def parse_iso_datetime(value: str) -> datetime:
+            """Parse an ISO 8601 API timestamp (e.g. "2026-02-20T10:00:00.000Z")."""
+            return datetime.fromisoformat(value)
+    else:
+        def parse_iso_datetime(value: str) -> datetime:
+            """Parse an ISO 8601 API timestamp (e.g. "2026-02-20T10:00:00.000Z")."""
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
 
 
 class BasePlatformFetcher(ABC):
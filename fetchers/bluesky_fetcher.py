@@ -4,15 +4,80 @@ BlueskyFetcher — fetches the authenticated user's Following timeline via atpro
 """
 
 import os
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from operator import itemgetter
 from datetime import datetime, timezone, timedelta
-from atproto import Client, models
+from typing import TYPE_CHECKING, Iterable, Iterator
 
 from scoring import calculate_engagement_score, add_z_scores
-from fetchers.base import BasePlatformFetcher
+from fetchers.base import BasePlatformFetcher, parse_iso_datetime
+
+if TYPE_CHECKING:
+    from atproto import Client
 
 _REQUIRED_ENV_VARS = ["BSKY_HANDLE", "BSKY_APP_PASSWORD"]
 
 
+@cache
+def _login(handle: str, password: str) -> "Client":
+    """
+    Log in (once per credential set) and return the atproto Client.
+
+    login() costs a session round-trip; the client refreshes its own tokens afterwards,
+    so later fetches in the same process reuse it.
+    """
+    # Imported here: atproto is the slowest SDK to import and unused when Bluesky is not configured.
+    from atproto import Client
+
+    client = Client()
+    client.login(handle, password)
+    return client
+
+
+def _raw_created_at(record) -> str:
+    """Return a post record's raw creation timestamp (snake_case or raw camelCase field)."""
+    return getattr(record, 'created_at', None) or getattr(record, 'createdAt', '')
+
+
+def _feed_time(feed_view) -> datetime:
+    """Timeline position of a feed item: the repost time for reposts, else the post's index time."""
+    reason = getattr(feed_view, 'reason', None)
+    return parse_iso_datetime(getattr(reason, 'indexed_at', None) or feed_view.post.indexed_at)
+
+
+def _is_before_cutoff(feed_view, cutoff_time: datetime) -> bool:
+    """True if the feed item sits before cutoff_time; unparseable timestamps never stop pagination."""
+    try:
+        return _feed_time(feed_view) < cutoff_time
+    except (ValueError, AttributeError, TypeError):
+        return False
+
+
+def _cutoff_index(page: list, cutoff_time: datetime) -> int:
+    """
+    Binary-search a newest-first timeline page for the first item positioned before cutoff_time.
+    Returns len(page) (no trim) if any timestamp on the search path cannot be parsed.
+    """
+    try:
+        return bisect_left(page, True, key=lambda view: _feed_time(view) < cutoff_time)
+    except (ValueError, AttributeError, TypeError):
+        return len(page)
+
+
+def _parse_timestamps(raw_values: list) -> list[datetime]:
+    """Parse raw ISO timestamps in one pass; unparseable values fall back to the current time."""
+    now = datetime.now(timezone.utc)
+    parsed = []
+    for value in raw_values:
+        try:
+            parsed.append(parse_iso_datetime(value))
+        except (ValueError, AttributeError, TypeError):
+            parsed.append(now)
+    return parsed
+
+
 class BlueskyFetcher(BasePlatformFetcher):
     """Fetches posts from the Bluesky Following timeline."""
 
@@ -40,48 +105,46 @@ class BlueskyFetcher(BasePlatformFetcher):
         else:
             print(f"[fetch-bluesky] Fetching posts since {cutoff_time.isoformat()}...")
 
-        feed_views = self._fetch_all_feeds(client, cutoff_time, limit)
-        posts = self._parse_posts(feed_views)
+        feed_views = self._iter_feeds(client, cutoff_time, limit)
+        # Time-window mode filters inside _parse_posts, before any post dict is built
+        posts = self._parse_posts(feed_views, cutoff_time if limit is None else None)
 
-        # Filter / truncate
-        if limit is None:
-            posts = [p for p in posts if p["created_at"] >= cutoff_time]
-        elif len(posts) > limit:
+        if limit is not None and len(posts) > limit:
             posts = posts[:limit]
 
         add_z_scores(posts)
         print(f"[fetch-bluesky] Retrieved {len(posts)} posts.")
-        posts.sort(key=lambda p: p["created_at"], reverse=True)
+        posts.sort(key=itemgetter("created_at"), reverse=True)
         return posts
 
     # ------------------------------------------------------------------ #
     # Internal helpers                                                     #
     # ------------------------------------------------------------------ #
 
-    def _get_client(self) -> Client:
-        """Build and return an authenticated atproto Client."""
+    def _get_client(self) -> "Client":
+        """Return an authenticated atproto Client, reused across fetch runs."""
         handle = os.environ.get("BSKY_HANDLE")
         password = os.environ.get("BSKY_APP_PASSWORD")
         if not handle or not password:
             raise ValueError("Missing BSKY_HANDLE or BSKY_APP_PASSWORD in environment.")
-        client = Client()
-        client.login(handle, password)
-        return client
+        return _login(handle, password)
 
-    def _parse_posts(self, feed_views: list) -> list[dict]:
-        """Transform atproto feed views into the standard Post dictionary list."""
-        parsed = []
-        seen_uris: set = set()
+    def _parse_posts(self, feed_views: Iterable, cutoff_time: datetime | None = None) -> list[dict]:
+        """
+        Transform atproto feed views into the standard Post dictionary list.
+
+        If `cutoff_time` is given, posts created before it are dropped once their
+        timestamps are parsed.
+        """
+        # Keyed by URI: the feed sometimes returns the same post again as a repost, and a plain
+        # dict write deduplicates with one hash (first position kept, identical content).
+        parsed: dict[str, tuple[dict, str]] = {}
 
         for feed_view in feed_views:
             post = feed_view.post
 
-            # Deduplicate (feed sometimes returns the same post as a repost)
-            if post.uri in seen_uris:
-                continue
-            seen_uris.add(post.uri)
-
-            rkey = post.uri.split('/')[-1]
+            uri = post.uri
+            rkey = uri.rpartition('/')[2]
             author_handle = post.author.handle
             url = f"https://bsky.app/profile/{author_handle}/post/{rkey}"
 
@@ -90,18 +153,12 @@ class BlueskyFetcher(BasePlatformFetcher):
             replies = getattr(post, 'reply_count', 0)
 
             record = post.record
-            try:
-                created_at_str = (getattr(record, 'created_at', None)
-                                  or getattr(record, 'createdAt', ''))
-                created_at = datetime.fromisoformat(created_at_str.replace('Z', '+00:00'))
-            except (ValueError, AttributeError, TypeError):
-                created_at = datetime.now(timezone.utc)
-
-            parsed.append({
-                "id": post.uri,
+
+            parsed[uri] = ({
+                "id": uri,
                 "platform": "bluesky",
                 "text": getattr(record, 'text', ''),
-                "created_at": created_at,
+                "created_at": None,  # filled in by the timestamp pass below
                 "author_name": post.author.display_name or author_handle,
                 "author_username": author_handle,
                 "likes": likes,
@@ -109,32 +166,49 @@ class BlueskyFetcher(BasePlatformFetcher):
                 "replies": replies,
                 "engagement_score": calculate_engagement_score(likes, reposts, replies),
                 "url": url,
-            })
-        return parsed
-
-    def _fetch_all_feeds(self, client: Client, cutoff_time: datetime, limit: int | None) -> list:
-        """Fetch pages from the timeline until cutoff or limit is reached."""
-        params = models.AppBskyFeedGetTimeline.Params(limit=100)
-        response = client.app.bsky.feed.get_timeline(params)
-        feed_views = response.feed
-
-        while getattr(response, 'cursor', None):
-            if limit is not None and len(feed_views) >= limit:
-                break
-
-            if limit is None and feed_views:
-                last_view = feed_views[-1]
-                try:
-                    created_at_str = (getattr(last_view.post.record, 'created_at', None)
-                                      or getattr(last_view.post.record, 'createdAt', ''))
-                    last_time = datetime.fromisoformat(created_at_str.replace('Z', '+00:00'))
-                    if last_time < cutoff_time:
-                        break
-                except (ValueError, AttributeError):
-                    pass
-
-            params = models.AppBskyFeedGetTimeline.Params(limit=100, cursor=response.cursor)
-            response = client.app.bsky.feed.get_timeline(params)
-            feed_views.extend(response.feed)
-
-        return feed_views
+            }, _raw_created_at(record))
+
+        # Timestamps are parsed in a separate pass so the loop above stays free of try/except.
+        entries = parsed.values()
+        kept = []
+        for (post_dict, _), created_at in zip(entries, _parse_timestamps([raw for _, raw in entries])):
+            if cutoff_time is None or created_at >= cutoff_time:
+                post_dict["created_at"] = created_at
+                kept.append(post_dict)
+        return kept
+
+    def _iter_feeds(self, client: "Client", cutoff_time: datetime, limit: int | None) -> Iterator:
+        """
+        Yield timeline feed views page by page until cutoff or limit is reached.
+
+        The next page is requested on a background thread as soon as the current page's cursor
+        is known, so the network round-trip overlaps with the caller parsing the current page.
+        Each raw page can be freed once it is parsed instead of buffering the whole timeline.
+        """
+        from atproto import models
+
+        def get_page(cursor: str | None):
+            params = models.AppBskyFeedGetTimeline.Params(limit=100, cursor=cursor)
+            return client.app.bsky.feed.get_timeline(params)
+
+        fetched = 0
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = executor.submit(get_page, None)
+            while pending is not None:
+                response = pending.result()
+                page = response.feed
+                pending = None
+
+                # The timeline is ordered by feed time, so one parse of the page's last item
+                # decides whether this is the boundary page.
+                if limit is None and page and _is_before_cutoff(page[-1], cutoff_time):
+                    # Drop the tail that falls outside the window so it is never parsed.
+                    # fetch_posts still filters on created_at: reposts carry their original, older timestamp.
+                    yield from page[:_cutoff_index(page, cutoff_time)]
+                    return
+
+                fetched += len(page)
+                cursor = getattr(response, 'cursor', None)
+                if cursor and (limit is None or fetched < limit):
+                    pending = executor.submit(get_page, cursor)
+                yield from page
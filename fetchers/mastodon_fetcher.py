@@ -5,12 +5,19 @@ MastodonFetcher — fetches the authenticated user's home timeline via Mastodon.
 
 import os
 import re
+import html
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
-from mastodon import Mastodon
+from functools import cache
+from operator import itemgetter
+from typing import TYPE_CHECKING, Iterable, Iterator
 
 from scoring import calculate_engagement_score, add_z_scores
 from fetchers.base import BasePlatformFetcher
 
+if TYPE_CHECKING:
+    from mastodon import Mastodon
+
 _REQUIRED_ENV_VARS = [
     "MASTODON_CLIENT_ID",
     "MASTODON_CLIENT_SECRET",
@@ -18,6 +25,30 @@ _REQUIRED_ENV_VARS = [
     "MASTODON_API_BASE_URL",
 ]
 
+# Paragraph and line breaks become newlines before the remaining tags are stripped.
+_HTML_BREAK_RE = re.compile(r"<br\s*/?>|</p>\s*<p[^>]*>", re.IGNORECASE)
+# Greedy negated class: one linear scan per tag, no lazy-quantifier backtracking.
+# Equivalent for Mastodon's HTML, where a literal "<" in text is always escaped as &lt;.
+_HTML_TAG_RE = re.compile(r"<[^>]*>")
+
+
+def _html_to_text(content: str) -> str:
+    """Convert Mastodon status HTML to plain text, keeping line structure and decoding entities."""
+    return html.unescape(_HTML_TAG_RE.sub('', _HTML_BREAK_RE.sub('\n', content)))
+
+
+@cache
+def _build_client(client_id: str, client_secret: str, access_token: str, api_base_url: str) -> "Mastodon":
+    """Build (once per credential set) a Mastodon client, keeping its HTTP session for later fetches."""
+    from mastodon import Mastodon
+
+    return Mastodon(
+        client_id=client_id,
+        client_secret=client_secret,
+        access_token=access_token,
+        api_base_url=api_base_url,
+    )
+
 
 class MastodonFetcher(BasePlatformFetcher):
     """Fetches posts from the Mastodon home timeline."""
@@ -46,20 +77,20 @@ class MastodonFetcher(BasePlatformFetcher):
         else:
             print(f"[fetch-mastodon] Fetching posts since {cutoff_time.isoformat()}...")
 
-        toots = self._fetch_all_toots(client, cutoff_time, limit)
+        toots = self._iter_toots(client, cutoff_time, limit)
         posts = self._parse_posts(toots)
         add_z_scores(posts)
 
         print(f"[fetch-mastodon] Retrieved {len(posts)} posts.")
-        posts.sort(key=lambda p: p["created_at"], reverse=True)
+        posts.sort(key=itemgetter("created_at"), reverse=True)
         return posts
 
     # ------------------------------------------------------------------ #
     # Internal helpers                                                     #
     # ------------------------------------------------------------------ #
 
-    def _get_client(self) -> Mastodon:
-        """Build and return an authenticated Mastodon client."""
+    def _get_client(self) -> "Mastodon":
+        """Return an authenticated Mastodon client, reused across fetch runs."""
         client_id = os.environ.get("MASTODON_CLIENT_ID")
         client_secret = os.environ.get("MASTODON_CLIENT_SECRET")
         access_token = os.environ.get("MASTODON_ACCESS_TOKEN")
@@ -71,14 +102,9 @@ class MastodonFetcher(BasePlatformFetcher):
                 "MASTODON_ACCESS_TOKEN, or MASTODON_API_BASE_URL in environment."
             )
 
-        return Mastodon(
-            client_id=client_id,
-            client_secret=client_secret,
-            access_token=access_token,
-            api_base_url=api_base_url,
-        )
+        return _build_client(client_id, client_secret, access_token, api_base_url)
 
-    def _parse_posts(self, toots: list) -> list[dict]:
+    def _parse_posts(self, toots: Iterable) -> list[dict]:
         """Transform Mastodon API toots into the standard Post dictionary list."""
         parsed = []
         for toot in toots:
@@ -91,8 +117,7 @@ class MastodonFetcher(BasePlatformFetcher):
             author_name = account.display_name if account.display_name else account.username
             author_username = account.acct
 
-            # Strip basic HTML tags from toot content
-            content_text = re.sub('<[^<]+?>', '', toot.content)
+            content_text = _html_to_text(toot.content)
 
             parsed.append({
                 "id": str(toot.id),
@@ -109,21 +134,30 @@ class MastodonFetcher(BasePlatformFetcher):
             })
         return parsed
 
-    def _fetch_all_toots(self, client: Mastodon, cutoff_time: datetime, limit: int | None) -> list:
-        """Fetch toots until cutoff time or limit is reached."""
-        toots = []
-        batch = client.timeline_home(limit=40)
-
-        while batch:
-            for toot in batch:
-                if limit is not None and len(toots) >= limit:
-                    return toots
-                if limit is None and toot.created_at < cutoff_time:
-                    return toots
-                toots.append(toot)
-
-            if limit is None and batch[-1].created_at < cutoff_time:
-                break
+    def _iter_toots(self, client: "Mastodon", cutoff_time: datetime, limit: int | None) -> Iterator:
+        """
+        Yield toots until cutoff time or limit is reached.
 
-            batch = client.fetch_next(batch)
-        return toots
+        Unless the current batch already reaches the limit or the cutoff, the next batch is
+        requested on a background thread while the caller parses this one.
+        """
+        fetched = 0
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            batch = client.timeline_home(limit=40)
+
+            while batch:
+                if limit is not None:
+                    last_batch = fetched + len(batch) >= limit
+                else:
+                    last_batch = batch[-1].created_at < cutoff_time
+                pending = None if last_batch else executor.submit(client.fetch_next, batch)
+
+                for toot in batch:
+                    if limit is not None and fetched >= limit:
+                        return
+                    if limit is None and toot.created_at < cutoff_time:
+                        return
+                    fetched += 1
+                    yield toot
+
+                batch = pending.result() if pending is not None else None
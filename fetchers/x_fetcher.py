@@ -4,11 +4,71 @@ XFetcher — fetches the authenticated user's home timeline via X API v2 (tweepy
 """
 
 import os
-import tweepy
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
+from functools import cache
+from operator import itemgetter
+from typing import TYPE_CHECKING
+
+import orjson
 
 from scoring import calculate_engagement_score, add_z_scores
-from fetchers.base import BasePlatformFetcher
+from fetchers.base import BasePlatformFetcher, parse_iso_datetime
+
+if TYPE_CHECKING:
+    import tweepy
+
+
+@cache
+def _orjson_client_class() -> type:
+    """
+    Build (once) a tweepy.Client subclass whose responses decode with orjson.
+
+    tweepy parses every timeline page via requests' ``response.json()`` (stdlib json);
+    overriding the public ``request`` hook swaps in orjson without patching tweepy globally.
+    """
+    import tweepy
+
+    class OrjsonClient(tweepy.Client):
+        def request(self, *args, **kwargs):
+            response = super().request(*args, **kwargs)
+            content = response.content
+            response.json = lambda **_: orjson.loads(content)
+            return response
+
+    return OrjsonClient
+
+
+@cache
+def _build_client(
+    bearer_token: str,
+    consumer_key: str,
+    consumer_secret: str,
+    access_token: str,
+    access_token_secret: str,
+) -> "tweepy.Client":
+    """
+    Build (once per credential set) a Tweepy v2 Client.
+
+    Reusing the client keeps its requests.Session, so repeated fetches in one process
+    share pooled keep-alive connections instead of re-doing the TLS handshake.
+    """
+    return _orjson_client_class()(
+        bearer_token=bearer_token,
+        consumer_key=consumer_key,
+        consumer_secret=consumer_secret,
+        access_token=access_token,
+        access_token_secret=access_token_secret,
+        wait_on_rate_limit=True,
+        # Plain dicts: skips building full tweepy Tweet/User models; _parse_tweets reads only the keys it needs.
+        return_type=dict,
+    )
+
+
+# Minimum spacing between timeline page requests. Back-to-back pages can trip the
+# rate limit, and wait_on_rate_limit then sleeps until the 15-minute window resets.
+_MIN_REQUEST_INTERVAL = 1.0
 
 _REQUIRED_ENV_VARS = [
     "X_API_KEY", "X_API_SECRET",
@@ -43,15 +103,14 @@ class XFetcher(BasePlatformFetcher):
     # Internal helpers                                                     #
     # ------------------------------------------------------------------ #
 
-    def _get_client(self) -> tweepy.Client:
-        """Build and return an authenticated Tweepy v2 Client."""
-        return tweepy.Client(
-            bearer_token=os.environ["X_BEARER_TOKEN"],
-            consumer_key=os.environ["X_API_KEY"],
-            consumer_secret=os.environ["X_API_SECRET"],
-            access_token=os.environ["X_ACCESS_TOKEN"],
-            access_token_secret=os.environ["X_ACCESS_TOKEN_SECRET"],
-            wait_on_rate_limit=True,
+    def _get_client(self) -> "tweepy.Client":
+        """Return an authenticated Tweepy v2 Client, reused across fetch runs."""
+        return _build_client(
+            os.environ["X_BEARER_TOKEN"],
+            os.environ["X_API_KEY"],
+            os.environ["X_API_SECRET"],
+            os.environ["X_ACCESS_TOKEN"],
+            os.environ["X_ACCESS_TOKEN_SECRET"],
         )
 
     def _prepare_fetch_params(self, hours: int, limit: int | None) -> tuple[datetime | None, int]:
@@ -64,85 +123,114 @@ class XFetcher(BasePlatformFetcher):
         print(f"[fetch-x] Fetching posts since {start_time.isoformat()} ...")
         return start_time, 100
 
-    def _extract_authors(self, response: tweepy.Response) -> dict:
-        """Extract author information from API response includes."""
+    def _extract_authors(self, response: dict) -> dict:
+        """Extract author information from the raw API response includes."""
         authors = {}
-        if response.includes and "users" in response.includes:
-            for user in response.includes["users"]:
-                authors[user.id] = {
-                    "name": user.name,
-                    "username": user.username,
-                }
+        for user in (response.get("includes") or {}).get("users", []):
+            authors[user["id"]] = {
+                "name": user["name"],
+                "username": user["username"],
+            }
         return authors
 
-    def _parse_tweets(self, tweets: list, authors: dict) -> list[dict]:
-        """Transform batch of tweets into list of dicts."""
+    def _parse_tweets(self, tweets: list[dict], authors: dict) -> list[dict]:
+        """Transform a batch of raw tweet objects into list of dicts."""
         parsed = []
+        append = parsed.append
+        get_author = authors.get
+        unknown = {"name": "Unknown", "username": "unknown"}
         for tweet in tweets:
-            author = authors.get(tweet.author_id, {"name": "Unknown", "username": "unknown"})
-            metrics = tweet.public_metrics or {}
-            parsed.append({
-                "id": tweet.id,
+            author = get_author(tweet.get("author_id"), unknown)
+            metrics = tweet.get("public_metrics") or {}
+            likes = metrics.get("like_count", 0)
+            reposts = metrics.get("retweet_count", 0)
+            replies = metrics.get("reply_count", 0)
+            tweet_id = int(tweet["id"])
+            username = author["username"]
+            append({
+                "id": tweet_id,
                 "platform": "x",
-                "text": tweet.text,
-                "created_at": tweet.created_at,
+                "text": tweet["text"],
+                "created_at": parse_iso_datetime(tweet["created_at"]),
                 "author_name": author["name"],
-                "author_username": author["username"],
-                "likes": metrics.get("like_count", 0),
-                "reposts": metrics.get("retweet_count", 0),
-                "replies": metrics.get("reply_count", 0),
-                "engagement_score": calculate_engagement_score(
-                    metrics.get("like_count", 0),
-                    metrics.get("retweet_count", 0),
-                    metrics.get("reply_count", 0)
-                ),
-                "url": f"https://x.com/{author['username']}/status/{tweet.id}",
+                "author_username": username,
+                "likes": likes,
+                "reposts": reposts,
+                "replies": replies,
+                "engagement_score": calculate_engagement_score(likes, reposts, replies),
+                "url": f"https://x.com/{username}/status/{tweet_id}",
             })
         return parsed
 
+    def _request_page(
+        self,
+        client: "tweepy.Client",
+        start_time: datetime | None,
+        max_results: int,
+        pagination_token: str | None,
+        not_before: float,
+    ) -> dict:
+        """Request one timeline page, first waiting until ``not_before`` (a time.monotonic() value)."""
+        wait = not_before - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+
+        return client.get_home_timeline(
+            start_time=start_time,
+            max_results=max_results,
+            pagination_token=pagination_token,
+            tweet_fields=["created_at", "public_metrics", "author_id", "text"],
+            expansions=["author_id"],
+            user_fields=["name", "username"],
+        )
+
     def _fetch_timeline(
         self,
-        client: tweepy.Client,
+        client: "tweepy.Client",
         hours: int = 24,
         limit: int | None = None,
     ) -> list[dict]:
         """
         Core pagination loop. Returns posts sorted newest-first with z-scores.
+
+        The next page is requested on a worker thread before the current one is parsed,
+        so parsing overlaps the following HTTP round-trip. Pages stay strictly sequential
+        (each needs the previous next_token) and keep the minimum request spacing.
         """
         start_time, max_results = self._prepare_fetch_params(hours, limit)
         posts = []
-        pagination_token = None
 
-        while True:
-            if limit is not None and len(posts) >= limit:
-                break
+        def page_size(fetched: int) -> int:
+            if limit is None:
+                return max_results
+            return min(max_results, limit - fetched)
 
-            fetch_count = max_results
-            if limit is not None:
-                fetch_count = min(max_results, limit - len(posts))
-                if fetch_count <= 0:
-                    break
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            future = None
+            if page_size(0) > 0:
+                future = pool.submit(self._request_page, client, start_time, page_size(0), None, 0.0)
 
-            response = client.get_home_timeline(
-                start_time=start_time,
-                max_results=fetch_count,
-                pagination_token=pagination_token,
-                tweet_fields=["created_at", "public_metrics", "author_id", "text", "entities"],
-                expansions=["author_id"],
-                user_fields=["name", "username"],
-            )
+            while future is not None:
+                response = future.result()
+                next_request_at = time.monotonic() + _MIN_REQUEST_INTERVAL
+                future = None
 
-            if not response.data:
-                break
+                tweets = response.get("data")
+                if not tweets:
+                    break
 
-            authors = self._extract_authors(response)
-            posts.extend(self._parse_tweets(response.data, authors))
+                # Every tweet becomes one post, so the next page size is known before parsing
+                pagination_token = (response.get("meta") or {}).get("next_token")
+                fetch_count = page_size(len(posts) + len(tweets))
+                if pagination_token and fetch_count > 0:
+                    future = pool.submit(
+                        self._request_page, client, start_time, fetch_count, pagination_token, next_request_at,
+                    )
 
-            pagination_token = (response.meta or {}).get("next_token")
-            if not pagination_token:
-                break
+                authors = self._extract_authors(response)
+                posts.extend(self._parse_tweets(tweets, authors))
 
         print(f"[fetch-x] Retrieved {len(posts)} posts.")
         add_z_scores(posts)
-        posts.sort(key=lambda p: p["created_at"], reverse=True)
+        posts.sort(key=itemgetter("created_at"), reverse=True)
         return posts
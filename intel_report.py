@@ -7,12 +7,27 @@ Configure in .env:
   INTEL_BACKEND=gemini         — uses GEMINI_API_KEY
   INTEL_BACKEND=ollama         — uses OLLAMA_MODEL and OLLAMA_URL (local)
   INTEL_BACKEND=ollama-cloud   — uses OLLAMA_CLOUD_API_KEY and OLLAMA_CLOUD_MODEL
+  INTEL_BACKEND=llamacpp       — uses LLAMACPP_URL (a local llama-server) for the map-reduce sections
 """
 
 import os
+import re
+import heapq
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
 import requests
-from google import genai
-from tenacity import retry, wait_exponential, stop_after_attempt, retry_if_exception_message
+from requests.adapters import HTTPAdapter
+import orjson
+
+# Shared keep-alive session: section, summary and cloud calls reuse pooled connections
+# instead of opening a fresh one per request.
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=0)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
 
 SYSTEM_PROMPT = """You are a Senior Strategic Intelligence Analyst. Transform the following social media posts into a high-level "Global Situation Report".
 
@@ -72,14 +87,36 @@ POSTS:
 # Gemini backend
 # ─────────────────────────────────────────
 
-@retry(
-    wait=wait_exponential(multiplier=1, min=4, max=60),
-    stop=stop_after_attempt(5),
-    retry=retry_if_exception_message(match="RESOURCE_EXHAUSTED")
-)
+_GEMINI_MAX_ATTEMPTS = 5
+
+
 def _gemini_generate(client, model: str, contents: str):
-    """Call Gemini with exponential backoff on rate limit."""
-    return client.models.generate_content(model=model, contents=contents)
+    """
+    Call Gemini with exponential backoff (4 s doubling up to 60 s) on rate limit.
+
+    Only HTTP 429 (RESOURCE_EXHAUSTED) is retried, matched on the SDK's typed error code
+    rather than on the exception text; anything else is raised immediately.
+    """
+    from google.genai import errors
+
+    delay = 4
+    for attempt in range(1, _GEMINI_MAX_ATTEMPTS + 1):
+        try:
+            return client.models.generate_content(model=model, contents=contents)
+        except errors.APIError as e:
+            if e.code != 429 or attempt == _GEMINI_MAX_ATTEMPTS:
+                raise
+        time.sleep(delay)
+        delay = min(delay * 2, 60)
+
+
+@lru_cache(maxsize=4)
+def _get_gemini_client(api_key: str):
+    """Build (once per API key) the Gemini client, so repeat calls reuse its HTTP connections."""
+    # Imported here: the Gemini SDK is slow to import and unused by the Ollama backends.
+    from google import genai
+
+    return genai.Client(api_key=api_key)
 
 
 def _generate_gemini(prompt: str) -> str:
@@ -87,7 +124,7 @@ def _generate_gemini(prompt: str) -> str:
     if not api_key:
         raise RuntimeError("GEMINI_API_KEY not set in environment")
 
-    client = genai.Client(api_key=api_key)
+    client = _get_gemini_client(api_key)
     model = os.getenv("GEMINI_MODEL", "gemini-flash-latest")
     try:
         response = _gemini_generate(client, model, prompt)
@@ -104,21 +141,105 @@ def _generate_gemini(prompt: str) -> str:
 # Ollama backend (local)
 # ─────────────────────────────────────────
 
-def _generate_ollama(prompt: str) -> str:
+def _stream_generate(
+    url: str,
+    model: str,
+    prompt: str,
+    headers: dict | None = None,
+    keep_alive: str | None = None,
+    options: dict | None = None,
+) -> str:
+    """
+    POST a streaming /api/generate request and assemble the response text.
+
+    Tokens are read as the server produces them, so the timeout applies between chunks
+    rather than to the whole generation. Raises on HTTP errors or an in-stream error.
+
+    ``keep_alive`` sets how long the server keeps the model loaded after the request.
+    ``options`` are passed through as model options (num_ctx, num_predict, ...).
+    """
+    body = {"model": model, "prompt": prompt, "stream": True}
+    if keep_alive is not None:
+        body["keep_alive"] = keep_alive
+    if options:
+        body["options"] = options
+    with _SESSION.post(
+        url,
+        headers=headers,
+        json=body,
+        stream=True,
+        timeout=300,
+    ) as response:
+        response.raise_for_status()
+        parts = []
+        for line in response.iter_lines():
+            if not line:
+                continue
+            chunk = orjson.loads(line)
+            if "error" in chunk:
+                raise RuntimeError(chunk["error"])
+            parts.append(chunk.get("response", ""))
+            if chunk.get("done"):
+                break
+    return "".join(parts)
+
+
+def _ollama_options() -> dict:
+    """
+    Model options for local generation, read from the environment.
+
+    Prompts here are one section's posts, so a modest context window keeps the KV cache
+    and prefill small; num_predict bounds runaway generations. num_thread is only sent
+    when set, since Ollama's own default (physical cores) is usually the fastest.
+    """
+    options = {
+        "num_ctx": int(os.getenv("OLLAMA_NUM_CTX", "4096")),
+        "num_predict": int(os.getenv("OLLAMA_NUM_PREDICT", "512")),
+    }
+    num_thread = os.getenv("OLLAMA_NUM_THREAD")
+    if num_thread:
+        options["num_thread"] = int(num_thread)
+    return options
+
+
+def _warm_ollama() -> None:
+    """
+    Ask the local Ollama server to load the generation model and keep it resident.
+
+    A request without a prompt only loads the model, so the cold-start cost is paid
+    while classification runs instead of on the first section call. The same options
+    as the real calls are sent, since a different num_ctx would force a reload. Best
+    effort: failures are ignored and surface later from the real requests.
+    """
     url = os.getenv("OLLAMA_URL", "http://localhost:11434/api/generate")
     model = os.getenv("OLLAMA_MODEL", "mistral")
+    keep_alive = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+    body = {"model": model, "keep_alive": keep_alive, "options": _ollama_options()}
     try:
-        response = requests.post(
-            url,
-            json={"model": model, "prompt": prompt, "stream": False},
-            timeout=300,
+        _SESSION.post(url, json=body, timeout=300).close()
+    except requests.RequestException:
+        pass
+
+
+def _generate_ollama(prompt: str, max_tokens: int | None = None) -> str:
+    url = os.getenv("OLLAMA_URL", "http://localhost:11434/api/generate")
+    model = os.getenv("OLLAMA_MODEL", "mistral")
+    keep_alive = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+    options = _ollama_options()
+    if max_tokens is not None:
+        # Per-call output budget, capped by OLLAMA_NUM_PREDICT (unless that is -1/-2,
+        # Ollama's "no limit"); decode time grows linearly with tokens produced
+        cap = options["num_predict"]
+        options["num_predict"] = min(max_tokens, cap) if cap > 0 else max_tokens
+    try:
+        text = _stream_generate(
+            url, model, prompt,
+            keep_alive=keep_alive,
+            options=options,
         )
-        response.raise_for_status()
-        payload = response.json()
     except Exception as e:
         raise RuntimeError(f"Ollama request failed: {e}") from e
 
-    text = payload.get("response", "")
     if not text:
         raise RuntimeError("Ollama returned an empty response")
     return text
@@ -138,20 +259,44 @@ def _generate_ollama_cloud(prompt: str) -> str:
     model = os.getenv("OLLAMA_CLOUD_MODEL", "gpt-oss:120b-cloud")
     
     try:
-        response = requests.post(
+        text = _stream_generate(url, model, prompt, headers={"Authorization": f"Bearer {api_key}"})
+    except Exception as e:
+        raise RuntimeError(f"Ollama Cloud request failed: {e}") from e
+
+    if not text:
+        raise RuntimeError("Ollama Cloud returned an empty response")
+    return text
+
+
+# ─────────────────────────────────────────
+# llama.cpp backend (llama-server, local)
+# ─────────────────────────────────────────
+
+def _generate_llamacpp(prompt: str, max_tokens: int | None = None) -> str:
+    """
+    Generate text with a llama.cpp llama-server via its native /completion endpoint.
+
+    Skips Ollama's wrapper layer; batch size, GPU layers, parallel slots and any draft
+    model are configured when llama-server starts.
+    """
+    url = os.getenv("LLAMACPP_URL", "http://localhost:8080/completion")
+    # LLAMACPP_N_PREDICT caps the caller's per-call budget (-1 means no limit)
+    n_predict = int(os.getenv("LLAMACPP_N_PREDICT", "512"))
+    if max_tokens is not None:
+        n_predict = min(max_tokens, n_predict) if n_predict > 0 else max_tokens
+    try:
+        response = _SESSION.post(
             url,
-            headers={"Authorization": f"Bearer {api_key}"},
-            json={"model": model, "prompt": prompt, "stream": False},
+            json={"prompt": prompt, "n_predict": n_predict, "stream": False, "cache_prompt": True},
             timeout=300,
         )
         response.raise_for_status()
-        payload = response.json()
+        text = orjson.loads(response.content).get("content", "")
     except Exception as e:
-        raise RuntimeError(f"Ollama Cloud request failed: {e}") from e
+        raise RuntimeError(f"llama.cpp request failed: {e}") from e
 
-    text = payload.get("response", "")
     if not text:
-        raise RuntimeError("Ollama Cloud returned an empty response")
+        raise RuntimeError("llama.cpp returned an empty response")
     return text
 
 
@@ -159,6 +304,13 @@ def _generate_ollama_cloud(prompt: str) -> str:
 # Map-Reduce pipeline (Ollama / local)
 # ─────────────────────────────────────────
 
+def _generate_local(prompt: str, max_tokens: int | None = None) -> str:
+    """Generate with the local backend selected by INTEL_BACKEND (Ollama unless llamacpp)."""
+    if os.getenv("INTEL_BACKEND", "").lower() == "llamacpp":
+        return _generate_llamacpp(prompt, max_tokens=max_tokens)
+    return _generate_ollama(prompt, max_tokens=max_tokens)
+
+
 SECTION_PROMPT = """You are a strategic intelligence analyst. Write a short thematic section for a Global Situation Report using ONLY the posts below. Use bullet points. Be concise and professional.
 
 CRITICAL RULES:
@@ -174,6 +326,26 @@ Posts:
 
 Write the section now:"""
 
+EXEC_SUMMARY_PROMPT = """You are a Strategic Intelligence Analyst.
+Read the following 6 drafted sections of a Global Situation Report.
+Write a SINGLE PARAGRAPH (max 4-5 sentences) "Executive Summary" that highlights the most critical developments from these sections.
+Do not use bullet points. Do not invent facts.
+
+DRAFTED SECTIONS:
+{sections}
+"""
+
+
+# Output budgets (num_predict) for each kind of local call: a section is a handful of
+# bullets, the executive summary a single paragraph.
+SECTION_MAX_TOKENS = 400
+SUMMARY_MAX_TOKENS = 250
+
+# Clean-up patterns for generated sections, compiled once.
+_URL_RE = re.compile(r"https?://\S+")
+_EMPTY_PARENS_RE = re.compile(r"\(\s*\)")
+_EMPTY_MD_LINK_RE = re.compile(r"\[\s*\]\(\s*\)")
+
 
 def _format_for_ai(posts: list[dict]) -> str:
     """Format a list of post dicts into a token-efficient string for the LLM."""
@@ -194,7 +366,7 @@ def generate_section(category: str, posts: list[dict]) -> str:
         category=category,
         posts=_format_for_ai(posts),
     )
-    section_text = _generate_ollama(prompt).strip()
+    section_text = _generate_local(prompt, max_tokens=SECTION_MAX_TOKENS).strip()
 
     # Strip any repeated category header the model may have added at the top
     first_line = section_text.splitlines()[0].strip() if section_text else ""
@@ -202,18 +374,33 @@ def generate_section(category: str, posts: list[dict]) -> str:
         section_text = "\n".join(section_text.splitlines()[1:]).strip()
 
     # Strip hallucinated URLs (model adds links from training memory)
-    import re
-    section_text = re.sub(r"https?://\S+", "", section_text)
-    section_text = re.sub(r"\(\s*\)", "", section_text)  # clean up empty parens left behind
-    section_text = re.sub(r"\[\s*\]\(\s*\)", "", section_text)  # clean up empty markdown links
+    section_text = _URL_RE.sub("", section_text)
+    section_text = _EMPTY_PARENS_RE.sub("", section_text)  # clean up empty parens left behind
+    section_text = _EMPTY_MD_LINK_RE.sub("", section_text)  # clean up empty markdown links
     section_text = "\n".join(line.rstrip() for line in section_text.splitlines())
 
     return f"**{category}**\n{section_text}\n"
 
 
+def _generate_sections(by_category: dict[str, list[dict]]) -> list[str]:
+    """
+    Draft every category section concurrently, keeping category order.
+
+    Sections are independent, so wall-clock time drops from the sum of the calls to
+    roughly the slowest one, up to the server's OLLAMA_NUM_PARALLEL slots. A thread
+    pool rather than an event loop keeps this callable from code already inside one.
+    """
+    if not by_category:
+        return []
+    with ThreadPoolExecutor(max_workers=len(by_category)) as executor:
+        # executor.map yields results in submission order, so sections keep category order.
+        return list(executor.map(generate_section, by_category.keys(), by_category.values()))
+
+
 def generate_intel_report_local(
     posts: list[dict],
     top_per_category: int = 10,
+    now: datetime | None = None,
 ) -> str:
     """
     Map-reduce pipeline for local models:
@@ -221,16 +408,37 @@ def generate_intel_report_local(
       2. Select top N per category by engagement
       3. Generate one section per category (1 model call per section)
       4. Assemble the final report
+
+    ``now`` dates the report header (default: the current UTC time).
     """
-    from classify import classify_post, select_top_per_category
-    from datetime import datetime, timezone
+    from classify import select_top_per_category
 
-    today = datetime.now(timezone.utc).strftime("%B %d, %Y")
-    model_name = os.getenv("OLLAMA_MODEL", "mistral")
-    agent_info = f"Agent: Ollama Intelligence | Model: {model_name}"
+    today = (now or datetime.now(timezone.utc)).strftime("%B %d, %Y")
+    use_llamacpp = os.getenv("INTEL_BACKEND", "").lower() == "llamacpp"
+    if use_llamacpp:
+        model_name = os.getenv("LLAMACPP_MODEL", "llama-server")
+        agent_info = f"Agent: llama.cpp Intelligence | Model: {model_name}"
+    else:
+        model_name = os.getenv("OLLAMA_MODEL", "mistral")
+        agent_info = f"Agent: Ollama Intelligence | Model: {model_name}"
 
     all_posts = posts
-    print(f"[intel] Map-reduce: {len(all_posts)} posts to classify...", flush=True)
+
+    # Optional cap on how many posts are embedded (off by default). It trades recall for
+    # speed: a post outside the global top N by cross-platform z-score is never classified,
+    # even if it would have made a sparse category's top N.
+    budget = int(os.getenv("CLASSIFY_BUDGET", "0"))
+    if 0 < budget < len(all_posts):
+        all_posts = heapq.nlargest(budget, all_posts, key=lambda p: p.get("normalized_score", 0.0))
+        print(f"[intel] Map-reduce: {len(all_posts)} posts to classify "
+              f"({len(posts) - len(all_posts)} over CLASSIFY_BUDGET dropped)...", flush=True)
+    else:
+        print(f"[intel] Map-reduce: {len(all_posts)} posts to classify...", flush=True)
+
+    # Load the generation model in the background while posts are being classified
+    # (llama-server loads its model at startup)
+    if not use_llamacpp:
+        threading.Thread(target=_warm_ollama, daemon=True).start()
 
     # Step 1: classify all posts via embedding cosine similarity (fast, no generation)
     from classify_embeddings import classify_posts_embedding
@@ -247,24 +455,16 @@ def generate_intel_report_local(
     category_counts = {cat: len(posts) for cat, posts in by_category.items()}
     print(f"[intel] Category distribution: {category_counts}", flush=True)
 
-    # Step 4: generate one section per category
-    sections = []
+    # Step 4: generate one section per category (concurrently)
     for cat, posts in by_category.items():
         print(f"[intel] Generating section: {cat} ({len(posts)} posts)...", flush=True)
-        sections.append(generate_section(cat, posts))
+    sections = _generate_sections(by_category)
 
     # Step 4.5: generate an executive summary based on the drafted sections
     combined_sections = "\n\n".join(sections)
     print("[intel] Generating Executive Summary...", flush=True)
-    exec_summary_prompt = f"""You are a Strategic Intelligence Analyst.
-Read the following 6 drafted sections of a Global Situation Report.
-Write a SINGLE PARAGRAPH (max 4-5 sentences) "Executive Summary" that highlights the most critical developments from these sections.
-Do not use bullet points. Do not invent facts.
-
-DRAFTED SECTIONS:
-{combined_sections}
-"""
-    exec_summary_text = _generate_ollama(exec_summary_prompt).strip()
+    exec_summary_prompt = EXEC_SUMMARY_PROMPT.format(sections=combined_sections)
+    exec_summary_text = _generate_local(exec_summary_prompt, max_tokens=SUMMARY_MAX_TOKENS).strip()
 
     # Step 5: assemble
     report = f"# Global Situation Report: {today}\n"
@@ -279,14 +479,21 @@ DRAFTED SECTIONS:
 # Public API
 # ─────────────────────────────────────────
 
-def generate_intel_report(posts: list[dict]) -> str:
-    """Generate a strategic intelligence report from the structured post list."""
+def generate_intel_report(posts: list[dict], now: datetime | None = None) -> str:
+    """
+    Generate a strategic intelligence report from the structured post list.
+
+    ``now`` is the run's timestamp used to date the report (default: the current UTC time).
+    """
     backend = os.getenv("INTEL_BACKEND", "gemini").lower()
     print(f"[intel] Using backend: {backend}", flush=True)
+    now = now or datetime.now(timezone.utc)
 
-    if backend == "ollama":
+    if backend in ("ollama", "llamacpp"):
         top_per_cat = int(os.getenv("OLLAMA_TOP_PER_CATEGORY", "10"))
-        return generate_intel_report_local(posts, top_per_cat)
+        return generate_intel_report_local(posts, top_per_cat, now=now)
+
+    today = now.strftime("%B %d, %Y")
     
     if backend == "ollama-cloud":
         # Use single-pass approach like Gemini for cloud models with large context windows
@@ -294,8 +501,6 @@ def generate_intel_report(posts: list[dict]) -> str:
         prompt = f"{SYSTEM_PROMPT}\n\nRAW SUMMARY:\n{_format_for_ai(posts)}"
         raw_report = _generate_ollama_cloud(prompt)
         
-        from datetime import datetime, timezone
-        today = datetime.now(timezone.utc).strftime("%B %d, %Y")
         agent_info = f"Agent: Ollama Cloud Intelligence | Model: {model_name}"
         
         report = f"# Global Situation Report: {today}\n"
@@ -312,8 +517,6 @@ def generate_intel_report(posts: list[dict]) -> str:
     raw_report = _generate_gemini(prompt)
 
     # Prepend attribution for Gemini as well
-    from datetime import datetime, timezone
-    today = datetime.now(timezone.utc).strftime("%B %d, %Y")
     agent_info = f"Agent: Gemini Intelligence | Model: {model_name}"
     
     # If the model already provided a title, we might want to insert below it.
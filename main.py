@@ -14,14 +14,22 @@ Usage:
 import os
 import sys
 import argparse
-import re
-import json
+import hashlib
+import asyncio
 from datetime import datetime, timezone
 from pathlib import Path
 
+import orjson
 from dotenv import load_dotenv
 from summarize import build_markdown
-from intel_report import generate_intel_report
+from intel_report import (
+    EXEC_SUMMARY_PROMPT,
+    SECTION_MAX_TOKENS,
+    SECTION_PROMPT,
+    SUMMARY_MAX_TOKENS,
+    SYSTEM_PROMPT,
+    generate_intel_report,
+)
 
 
 def _ensure_utf8_stdout() -> None:
@@ -39,62 +47,6 @@ def _load_env(env_path: Path) -> None:
     load_dotenv(dotenv_path=env_path)
 
 
-def _process_truncate_section(section_lines: list[str], current_total: int, limit: int) -> tuple[str, int]:
-    """Helper to process a section's posts and truncate them to fit the limit."""
-    post_end_indices = [i for i, l in enumerate(section_lines) if "[View post](" in l]
-    
-    if not post_end_indices:
-        return "", 0
-        
-    current_section = [section_lines[0]]  # Add ## @author line
-    last_e = 1
-    posts_added = 0
-    
-    for e in post_end_indices:
-        if current_total + posts_added >= limit:
-            break
-        current_section.append("\n".join(section_lines[last_e:e+1]))
-        posts_added += 1
-        last_e = e + 1
-        
-    if posts_added > 0:
-        return "\n".join(current_section), posts_added
-    return "", 0
-
-
-def _truncate_markdown(markdown: str, intel_limit: int) -> str:
-    """
-    Limit the markdown sent to the AI to the top N posts by engagement.
-    Preserves the header section and truncates at the post level.
-    Posts are identified by the '> ❤️' engagement line in the markdown.
-    """
-    lines = markdown.splitlines()
-
-    # Find where per-author sections begin (lines starting with ## @)
-    section_indices = [i for i, l in enumerate(lines) if l.startswith("## @")]
-
-    if not section_indices or intel_limit <= 0:
-        return markdown
-
-    header = "\n".join(lines[:section_indices[0]])
-    kept_sections = []
-    total = 0
-
-    for idx, start in enumerate(section_indices):
-        if total >= intel_limit:
-            break
-            
-        end = section_indices[idx + 1] if idx + 1 < len(section_indices) else len(lines)
-        section_str, posts_added = _process_truncate_section(lines[start:end], total, intel_limit)
-        
-        if posts_added > 0:
-            kept_sections.append(section_str)
-            total += posts_added
-
-    print(f"[intel] Truncated to ~{total} posts (limit: {intel_limit})", flush=True)
-    return header + "\n\n" + "\n\n".join(kept_sections)
-
-
 def _parse_args():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description="Fetch and summarize X home timeline.")
@@ -120,7 +72,7 @@ def _parse_args():
     parser.add_argument(
         "--intel-backend",
         type=str,
-        choices=["gemini", "ollama", "ollama-cloud"],
+        choices=["gemini", "ollama", "ollama-cloud", "llamacpp"],
         help="The intelligence backend to use (overrides INTEL_BACKEND env var)."
     )
     parser.add_argument(
@@ -131,11 +83,26 @@ def _parse_args():
         metavar="FILE",
         help="Skip API fetch and re-use existing JSON cache file. Pass a path, or omit for today's file."
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore the on-disk embedding and intel report caches: re-classify every post and regenerate the report."
+    )
+    parser.add_argument(
+        "--no-summary-md",
+        action="store_true",
+        help="Skip building and saving the markdown summary; only the JSON cache and intel report are written."
+    )
     return parser.parse_args()
 
 
-def _load_existing_cache(from_cache_arg: str, output_dir: Path, now: datetime) -> tuple[str, list[dict]]:
-    """Load an existing JSON cache file and its companion markdown summary."""
+def _load_existing_cache(from_cache_arg: str, output_dir: Path, now: datetime) -> list[dict]:
+    """
+    Load the posts from an existing JSON cache file.
+
+    The intel report works from the structured posts, so the companion markdown
+    summary is not read back.
+    """
     if from_cache_arg:
         json_path = Path(from_cache_arg)
         if json_path.suffix == ".md":
@@ -148,19 +115,29 @@ def _load_existing_cache(from_cache_arg: str, output_dir: Path, now: datetime) -
         print(f"[error] JSON cache file not found: {json_path}")
         sys.exit(1)
 
-    with json_path.open("r", encoding="utf-8") as f:
-        posts = json.load(f)
-
-    # Load companion markdown if needed for backwards compatibility downstream (optional)
-    md_path = json_path.with_name(json_path.name.replace("posts_", "summary_").replace(".json", ".md"))
-    markdown = md_path.read_text(encoding="utf-8") if md_path.exists() else ""
+    # orjson parses the UTF-8 bytes directly: one read, no text decoding layer
+    posts = orjson.loads(json_path.read_bytes())
 
     print(f"[skip] Loaded existing cache -> {json_path} ({len(posts)} posts)")
-    return markdown, posts
+    return posts
 
 
-def _run_fetch_and_summarize(args, env_path: Path, output_dir: Path, now: datetime) -> tuple[str, list[dict]]:
-    """Fetch posts from configured sources and build a summary markdown."""
+async def _fetch_all(fetchers: list, limit: int | None) -> list[dict]:
+    """
+    Fetch every source concurrently and merge the results in fetcher order.
+
+    The platform SDKs are blocking, so each fetch_posts runs in a worker thread;
+    wall-clock time becomes the slowest source rather than the sum of all of them.
+    """
+    results = await asyncio.gather(*(
+        asyncio.to_thread(fetcher.fetch_posts, hours=24, limit=limit)
+        for fetcher in fetchers
+    ))
+    return [post for fetched in results for post in fetched]
+
+
+def _run_fetch_and_summarize(args, env_path: Path, output_dir: Path, now: datetime) -> list[dict]:
+    """Fetch posts from configured sources, save the JSON cache (and summary markdown unless --no-summary-md), and return the posts."""
     _load_env(env_path)
 
     from fetchers import XFetcher, BlueskyFetcher, MastodonFetcher
@@ -171,41 +148,104 @@ def _run_fetch_and_summarize(args, env_path: Path, output_dir: Path, now: dateti
         if f.is_configured() and args.source in ("all", f.platform_name)
     ]
 
-    posts = []
-    for fetcher in active_fetchers:
-        posts.extend(fetcher.fetch_posts(hours=24, limit=args.limit))
+    posts = asyncio.run(_fetch_all(active_fetchers, args.limit))
 
     if not posts:
         print(f"[error] No posts fetched. Verify your credentials in .env. Attempted fetching for source: {args.source}")
         sys.exit(1)
 
-    markdown = build_markdown(posts, generated_at=now)
-
     date_str = now.strftime('%Y-%m-%d')
-    output_path = output_dir / f"summary_{date_str}.md"
-    output_path.write_text(markdown, encoding="utf-8")
-    
+    # The intel report works from the posts, so the markdown is only built when wanted
+    if not getattr(args, "no_summary_md", False):
+        markdown = build_markdown(posts, generated_at=now)
+        output_path = output_dir / f"summary_{date_str}.md"
+        output_path.write_text(markdown, encoding="utf-8")
+        print(f"[done] Summary saved → {output_path}")
+
+    # Always save the JSON cache so --from-cache keeps working
     json_path = output_dir / f"posts_{date_str}.json"
-    json_path.write_text(json.dumps(posts, indent=2, default=str), encoding="utf-8")
+    # Compact orjson output: serialized in C (datetimes natively, as ISO 8601) and a fraction
+    # of the size of the indented stdlib output, which also speeds up the --from-cache read
+    json_path.write_bytes(orjson.dumps(posts, default=str))
 
-    print(f"[done] Summary saved → {output_path}")
     print(f"[done] JSON cache saved → {json_path}")
-    return markdown, posts
+    return posts
+
+
+# Cached reports kept in the intel report cache; older entries are pruned by mtime.
+_INTEL_CACHE_MAX_ENTRIES = 32
+
+# Settings that change what the report says; each one is part of the cache key.
+_INTEL_CACHE_SETTINGS = (
+    "OLLAMA_URL", "OLLAMA_TOP_PER_CATEGORY", "CLASSIFY_BUDGET",
+    "OLLAMA_NUM_CTX", "OLLAMA_NUM_PREDICT", "OLLAMA_NUM_THREAD",
+    "OLLAMA_EMBED_MODEL", "OLLAMA_EMBED_URL",
+    "LLAMACPP_URL", "LLAMACPP_N_PREDICT", "OLLAMA_CLOUD_URL",
+)
+
+
+def _intel_cache_path(posts: list[dict], backend: str, model: str, now: datetime) -> Path | None:
+    """
+    Cache file for the report of exactly these posts, or None when caching is disabled.
+
+    The key covers each post's id and engagement score, the backend, model and report
+    date, the prompt templates and output budgets, and the generation settings in
+    _INTEL_CACHE_SETTINGS, so changing any of them produces a fresh report.
+    INTEL_REPORT_CACHE names the cache directory; it is off unless set.
+    """
+    cache_dir = os.getenv("INTEL_REPORT_CACHE", "")
+    if not cache_dir:
+        return None
+    prompts = [
+        SYSTEM_PROMPT, SECTION_PROMPT, EXEC_SUMMARY_PROMPT, SECTION_MAX_TOKENS, SUMMARY_MAX_TOKENS,
+    ]
+    settings = [os.getenv(name) for name in _INTEL_CACHE_SETTINGS]
+    fingerprint = orjson.dumps(
+        [backend, model, now.strftime("%Y-%m-%d"), prompts, settings,
+         [(p.get("id"), p.get("engagement_score")) for p in posts]],
+        default=str,
+    )
+    key = hashlib.blake2b(fingerprint, digest_size=16).hexdigest()
+    return Path(cache_dir) / f"{key}.md"
+
+
+def _store_intel_cache(cache_path: Path, intel_md: str) -> None:
+    """Save a generated report to the cache, keeping only the newest entries."""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(intel_md, encoding="utf-8")
+    entries = sorted(cache_path.parent.glob("*.md"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for stale in entries[_INTEL_CACHE_MAX_ENTRIES:]:
+        stale.unlink(missing_ok=True)
 
 
 def _generate_and_save_intel_report(posts: list[dict], now: datetime, output_dir: Path, intel_limit: int, intel_backend: str | None = None):
-    """Generate the AI intelligence report and save it to disk."""
+    """
+    Generate the AI intelligence report and save it to disk.
+
+    When INTEL_REPORT_CACHE is set, a report already generated for the same posts,
+    backend, model, prompts and settings on the same day is reused from the cache
+    instead of calling the model again.
+    """
     posts_to_analyze = posts[:intel_limit] if intel_limit > 0 else posts
 
     if intel_backend:
         os.environ["INTEL_BACKEND"] = intel_backend
 
     backend = os.getenv("INTEL_BACKEND", "gemini")
-    model = (os.getenv("OLLAMA_MODEL", "") if backend == "ollama" 
+    model = (os.getenv("OLLAMA_MODEL", "") if backend == "ollama"
+             else os.getenv("LLAMACPP_MODEL", "") if backend == "llamacpp"
+             else os.getenv("OLLAMA_CLOUD_MODEL", "") if backend == "ollama-cloud"
              else os.getenv("GEMINI_MODEL", "gemini-flash-latest"))
-    print(f"[intel] Generating report for {len(posts_to_analyze)} posts (backend={backend}, model={model or 'default'})...")
 
-    intel_md = generate_intel_report(posts_to_analyze)
+    cache_path = _intel_cache_path(posts_to_analyze, backend, model, now)
+    if cache_path is not None and cache_path.is_file():
+        intel_md = cache_path.read_text(encoding="utf-8")
+        print(f"[skip] Reusing cached intel report for identical input -> {cache_path}")
+    else:
+        print(f"[intel] Generating report for {len(posts_to_analyze)} posts (backend={backend}, model={model or 'default'})...")
+        intel_md = generate_intel_report(posts_to_analyze, now)
+        if cache_path is not None:
+            _store_intel_cache(cache_path, intel_md)
 
     intel_filename = f"intel_report_{now.strftime('%Y-%m-%d')}.md"
     intel_path = output_dir / intel_filename
@@ -223,15 +263,20 @@ def main():
     if env_path.exists():
         load_dotenv(dotenv_path=env_path)
 
+    if getattr(args, "no_cache", False):
+        # An empty path disables the embedding (and thus classification) and report caches
+        os.environ["OLLAMA_EMBED_CACHE"] = ""
+        os.environ["INTEL_REPORT_CACHE"] = ""
+
     output_dir = Path(__file__).parent / "summaries"
     output_dir.mkdir(exist_ok=True)
     now = datetime.now(timezone.utc)
 
     try:
         if args.from_cache is not None:
-            _, posts = _load_existing_cache(args.from_cache, output_dir, now)
+            posts = _load_existing_cache(args.from_cache, output_dir, now)
         else:
-            _, posts = _run_fetch_and_summarize(args, env_path, output_dir, now)
+            posts = _run_fetch_and_summarize(args, env_path, output_dir, now)
 
         _generate_and_save_intel_report(posts, now, output_dir, args.intel_limit, getattr(args, "intel_backend", None))
     except Exception as e:
@@ -11,8 +11,12 @@ Schedule with cron (macOS/Linux) — e.g. daily at 07:00:
 Schedule with Windows Task Scheduler:
     Program: python.exe
     Arguments: C:\\path\\to\\x_daily_summary\\run_daily.py
+
+The summary runs in this process, avoiding a second interpreter start-up and
+re-import of every dependency. Pass --isolated to run main.py in a subprocess instead.
 """
 
+import os
 import subprocess
 import sys
 from datetime import datetime
@@ -22,20 +26,49 @@ SCRIPT_DIR = Path(__file__).parent
 MAIN_PY = SCRIPT_DIR / "main.py"
 
 
-def main():
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    print(f"[run] Starting X daily summary at {now}...")
-
+def _run_isolated() -> int:
+    """Run main.py in a fresh interpreter and return its exit code."""
     result = subprocess.run(
         [sys.executable, str(MAIN_PY)],
         cwd=str(SCRIPT_DIR),
     )
+    return result.returncode
+
+
+def _run_in_process() -> int:
+    """Run main.main() in this interpreter and return the exit code it would have had."""
+    if str(SCRIPT_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPT_DIR))
+    from main import main as run_summary
+
+    # main() parses its own CLI flags; run it with none and from the script
+    # directory, as the subprocess did
+    saved_argv, saved_cwd = sys.argv, os.getcwd()
+    sys.argv = [str(MAIN_PY)]
+    os.chdir(SCRIPT_DIR)
+    try:
+        run_summary()
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        return 1
+    finally:
+        sys.argv = saved_argv
+        os.chdir(saved_cwd)
+    return 0
+
+
+def main():
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(f"[run] Starting X daily summary at {now}...")
+
+    returncode = _run_isolated() if "--isolated" in sys.argv[1:] else _run_in_process()
 
-    if result.returncode == 0:
+    if returncode == 0:
         print("[run] Done! Check the summaries/ folder for today's digest.")
     else:
-        print(f"[run] Script exited with errors (code {result.returncode}). Check the output above.")
-        sys.exit(result.returncode)
+        print(f"[run] Script exited with errors (code {returncode}). Check the output above.")
+        sys.exit(returncode)
 
 
 if __name__ == "__main__":
@@ -3,8 +3,6 @@ scoring.py
 Shared logic for engagement calculation and ranking across different platforms.
 """
 
-import math
-
 def calculate_engagement_score(likes: int, reposts: int, replies: int) -> int:
     """
     Unified formula for cross-platform engagement.
@@ -19,16 +17,23 @@ def add_z_scores(posts: list[dict]) -> None:
     """
     if not posts:
         return
-        
-    scores = [p.get('engagement_score', 0) for p in posts]
-    mean = sum(scores) / len(scores)
-    
-    # Calculate population standard deviation
-    variance = sum((s - mean) ** 2 for s in scores) / len(scores)
-    std_dev = math.sqrt(variance)
-    
-    for p in posts:
-        if std_dev == 0:
+
+    # Imported here: every fetcher imports this module, and NumPy's import cost is only
+    # worth paying once there are posts to score.
+    import numpy as np
+
+    scores = np.fromiter((p.get('engagement_score', 0) for p in posts), dtype=np.float64, count=len(posts))
+
+    # Deviations are computed once and reused for both the population std (ddof=0)
+    # and the z-scores, instead of std() and mean() each re-deriving the mean.
+    deviations = scores - scores.mean()
+    std_dev = np.sqrt(deviations @ deviations / len(posts))
+    if len(posts) < 2 or std_dev == 0:
+        for p in posts:
             p['normalized_score'] = 0.0
-        else:
-            p['normalized_score'] = (p.get('engagement_score', 0) - mean) / std_dev
+        return
+
+    # tolist() hands back plain Python floats instead of boxing one numpy scalar per post
+    z_scores = (deviations / std_dev).tolist()
+    for p, z in zip(posts, z_scores):
+        p['normalized_score'] = z
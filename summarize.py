@@ -4,6 +4,7 @@ Takes a list of post dicts and produces a markdown daily digest string.
 Posts are grouped by author, sorted by engagement.
 """
 
+from collections import defaultdict
 from datetime import datetime, timezone
 
 
@@ -19,10 +20,10 @@ def _get_sort_score(post: dict) -> float:
 
 def _group_by_author(posts: list[dict]) -> dict[str, list[dict]]:
     """Group posts by their platform + author username to prevent cross-network collisions."""
-    by_author: dict[str, list[dict]] = {}
+    # defaultdict creates missing groups in C, without setdefault's throwaway list per post
+    by_author: defaultdict[str, list[dict]] = defaultdict(list)
     for post in posts:
-        key = f"{post.get('platform', 'x')}_{post['author_username']}"
-        by_author.setdefault(key, []).append(post)
+        by_author[f"{post.get('platform', 'x')}_{post['author_username']}"].append(post)
     return by_author
 
 
@@ -53,23 +54,27 @@ def _format_author_section(lines: list[str], author_posts: list[dict]):
     # Sort posts by engagement within this author
     sorted_posts = sorted(author_posts, key=_get_sort_score, reverse=True)
 
-    lines.append(f"## [{platform}] @{username} — {name}")
-    lines.append("")
+    # Bind append once: this loop runs for every post across the whole timeline.
+    append = lines.append
+    append(f"## [{platform}] @{username} — {name}")
+    append("")
 
     for post in sorted_posts:
         ts = post["created_at"]
         ts_str = ts.strftime("%H:%M UTC") if hasattr(ts, "strftime") else str(ts)
         fire = " 🔥" if post["likes"] >= FIRE_THRESHOLD else ""
-        stats = f"❤️ {post['likes']:,}  🔁 {post['reposts']:,}  💬 {post['replies']:,}"
         quoted_text = "\n> ".join(post["text"].splitlines())
 
-        lines.append(f"> {quoted_text}")
-        lines.append(">")
-        lines.append(f"> {stats}{fire}  ·  🕐 {ts_str}  ·  [View post]({post['url']})")
-        lines.append("")
+        # One string per post block (text, spacer, stats line, trailing blank line)
+        append(
+            f"> {quoted_text}\n"
+            ">\n"
+            f"> ❤️ {post['likes']:,}  🔁 {post['reposts']:,}  💬 {post['replies']:,}{fire}"
+            f"  ·  🕐 {ts_str}  ·  [View post]({post['url']})\n"
+        )
 
-    lines.append("---")
-    lines.append("")
+    append("---")
+    append("")
 
 
 def build_markdown(posts: list[dict], generated_at: datetime | None = None) -> str:
@@ -2,10 +2,11 @@
 tests/test_classify_embeddings.py
 Tests for classify_embeddings.py — embedding-based post classification.
 
-All tests monkeypatch requests.post to avoid needing a live Ollama instance.
+All tests monkeypatch the shared requests session to avoid needing a live Ollama instance.
 """
 
 import sys
+import json as jsonlib
 import pathlib
 import math
 import pytest
@@ -15,11 +16,22 @@ sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
 from classify_embeddings import (
     cosine_similarity,
     classify_posts_embedding,
+    get_embeddings_batch,
+    _embed_base_url,
+    _embed_texts,
+    _embed_workers,
     CATEGORY_DESCRIPTIONS,
+    EMBED_MAX_WORKERS,
 )
 from classify import CATEGORIES
 
 
+@pytest.fixture(autouse=True)
+def _no_embed_cache(monkeypatch):
+    """Disable the on-disk embedding cache so tests never share vectors."""
+    monkeypatch.setenv("OLLAMA_EMBED_CACHE", "")
+
+
 # ─────────────────────────────────────────────────────────────
 # cosine_similarity unit tests
 # ─────────────────────────────────────────────────────────────
@@ -54,16 +66,26 @@ def test_cosine_opposite_vectors():
 # ─────────────────────────────────────────────────────────────
 
 def _make_embed_response(vector: list[float]):
-    """Build a minimal mock response object for requests.post."""
+    """Build a minimal mock response object for _SESSION.post."""
     class MockResponse:
+        status_code = 200
+        content = jsonlib.dumps({"embedding": vector}).encode()
         def raise_for_status(self):
             # Intentionally a no-op: mock response always represents a 200 OK.
             pass
-        def json(self):
-            return {"embedding": vector}
     return MockResponse()
 
 
+def _make_batch_response(vectors: list[list[float]]):
+    """Build a mock /api/embed response carrying one vector per input."""
+    class MockBatchResponse:
+        status_code = 200
+        content = jsonlib.dumps({"embeddings": vectors}).encode()
+        def raise_for_status(self):
+            pass
+    return MockBatchResponse()
+
+
 def test_classify_posts_embedding_assigns_correct_category(monkeypatch):
     """
     Posts should be assigned to the category whose anchor embedding is
@@ -88,7 +110,7 @@ def test_classify_posts_embedding_assigns_correct_category(monkeypatch):
         call_count[0] += 1
         return _make_embed_response(cat_vectors["AI & Technology"])
 
-    monkeypatch.setattr("classify_embeddings.requests.post", fake_post)
+    monkeypatch.setattr("classify_embeddings._SESSION.post", fake_post)
 
     posts = [{"text": "GPT-5 just dropped, it's incredible!"}]
     result_count = classify_posts_embedding(posts)
@@ -100,7 +122,7 @@ def test_classify_posts_embedding_assigns_correct_category(monkeypatch):
 def test_classify_posts_embedding_skips_empty_text(monkeypatch):
     """Posts with empty text should be skipped entirely (no 'category' key set)."""
     monkeypatch.setattr(
-        "classify_embeddings.requests.post",
+        "classify_embeddings._SESSION.post",
         lambda *a, **kw: _make_embed_response([1.0, 0.0]),
     )
     posts = [{"text": ""}, {"text": "   "}]
@@ -116,7 +138,7 @@ def test_classify_posts_embedding_all_same_vector_picks_first(monkeypatch):
     The key requirement is: no crash, and some valid category is always returned.
     """
     monkeypatch.setattr(
-        "classify_embeddings.requests.post",
+        "classify_embeddings._SESSION.post",
         lambda *a, **kw: _make_embed_response([1.0] * 10),
     )
     posts = [{"text": "Some post with ambiguous topic."}]
@@ -124,31 +146,33 @@ def test_classify_posts_embedding_all_same_vector_picks_first(monkeypatch):
     assert posts[0].get("category") in CATEGORIES
 
 
-def test_classify_posts_embedding_handles_http_error(monkeypatch):
-    """If an embed call fails for a post, it should be skipped gracefully."""
-    embed_call = [0]
+def test_classify_posts_embedding_handles_http_error(monkeypatch, capsys):
+    """If the post embed call fails, the posts are skipped gracefully after the anchors embedded."""
+    descriptions = [CATEGORY_DESCRIPTIONS[cat] for cat in CATEGORIES]
+    calls = {"anchors": 0, "posts": 0}
 
     def flaky_post(url, json=None, timeout=None):
-        prompt = json.get("prompt", "")
-        # Category anchors succeed; post embed fails
-        for desc in CATEGORY_DESCRIPTIONS.values():
-            if prompt == desc:
-                return _make_embed_response([1.0, 0.0, 0.0])
-        embed_call[0] += 1
+        # Category anchors succeed; the post batch fails
+        if json["input"] == descriptions:
+            calls["anchors"] += 1
+            return _make_batch_response([[1.0, 0.0, 0.0]] * len(descriptions))
+        calls["posts"] += 1
         raise OSError("simulated network error")
 
-    monkeypatch.setattr("classify_embeddings.requests.post", flaky_post)
+    monkeypatch.setattr("classify_embeddings._SESSION.post", flaky_post)
 
     posts = [{"text": "This post will fail to embed."}]
     result_count = classify_posts_embedding(posts)
     assert result_count == 0
     assert "category" not in posts[0]
+    assert calls == {"anchors": 1, "posts": 1}
+    assert "could not embed any categories" not in capsys.readouterr().out
 
 
 def test_classify_posts_embedding_multiple_posts(monkeypatch):
     """All non-empty posts should receive a category from the known CATEGORIES list."""
     monkeypatch.setattr(
-        "classify_embeddings.requests.post",
+        "classify_embeddings._SESSION.post",
         lambda *a, **kw: _make_embed_response([0.5] * 8),
     )
     posts = [
@@ -160,6 +184,172 @@ def test_classify_posts_embedding_multiple_posts(monkeypatch):
         assert post.get("category") in CATEGORIES
 
 
+def test_classify_posts_embedding_embeds_duplicate_text_once(monkeypatch):
+    """Posts sharing the same text should trigger a single embedding and all get classified."""
+    embedded_inputs = []
+
+    def fake_post(url, json=None, timeout=None):
+        embedded_inputs.extend(json["input"])
+        return _make_batch_response([[1.0, 0.0]] * len(json["input"]))
+
+    monkeypatch.setattr("classify_embeddings._SESSION.post", fake_post)
+
+    posts = [{"text": "Same headline"}, {"text": "Same headline "}, {"text": "Other"}]
+    assert classify_posts_embedding(posts) == 3
+    assert embedded_inputs.count("Same headline") == 1
+    assert all(p.get("category") in CATEGORIES for p in posts)
+
+
+def test_embed_base_url_strips_endpoint_suffix():
+    """Both the legacy and batch endpoint paths reduce to the server root."""
+    assert _embed_base_url("http://localhost:11434/api/embeddings") == "http://localhost:11434"
+    assert _embed_base_url("http://localhost:11434/api/embed/") == "http://localhost:11434"
+    assert _embed_base_url("http://localhost:11434") == "http://localhost:11434"
+
+
+def test_embed_workers_reads_env_and_caps_at_pool_size(monkeypatch):
+    monkeypatch.delenv("OLLAMA_EMBED_CONCURRENCY", raising=False)
+    assert _embed_workers() == EMBED_MAX_WORKERS
+    monkeypatch.setenv("OLLAMA_EMBED_CONCURRENCY", "4")
+    assert _embed_workers() == 4
+    monkeypatch.setenv("OLLAMA_EMBED_CONCURRENCY", "500")
+    assert _embed_workers() == 32
+    monkeypatch.setenv("OLLAMA_EMBED_CONCURRENCY", "0")
+    assert _embed_workers() == 1
+
+
+def test_get_embeddings_batch_uses_embed_endpoint(monkeypatch):
+    """A single /api/embed call should return one vector per input text."""
+    calls = []
+
+    def fake_post(url, json=None, timeout=None):
+        calls.append((url, json))
+        return _make_batch_response([[1.0, 0.0], [0.0, 1.0]])
+
+    monkeypatch.setattr("classify_embeddings._SESSION.post", fake_post)
+
+    vecs = get_embeddings_batch(["a", "b"], "nomic-embed-text", "http://host:11434")
+    assert vecs.tolist() == [[1.0, 0.0], [0.0, 1.0]]
+    assert calls == [("http://host:11434/api/embed", {"model": "nomic-embed-text", "input": ["a", "b"]})]
+
+
+def test_get_embeddings_batch_falls_back_to_legacy_endpoint(monkeypatch):
+    """Without an "embeddings" key, each text is embedded via /api/embeddings."""
+    urls = []
+
+    def fake_post(url, json=None, timeout=None):
+        urls.append(url)
+        return _make_embed_response([0.5, 0.5])
+
+    monkeypatch.setattr("classify_embeddings._SESSION.post", fake_post)
+
+    vecs = get_embeddings_batch(["a", "b"], "nomic-embed-text", "http://host:11434")
+    assert vecs.tolist() == [[0.5, 0.5], [0.5, 0.5]]
+    assert urls == [
+        "http://host:11434/api/embed",
+        "http://host:11434/api/embeddings",
+        "http://host:11434/api/embeddings",
+    ]
+
+
+def test_get_embeddings_batch_falls_back_when_embed_route_is_missing(monkeypatch):
+    """A server without /api/embed answers 404; texts are then embedded via /api/embeddings."""
+    class NotFound:
+        status_code = 404
+
+        def raise_for_status(self):
+            raise AssertionError("a 404 from /api/embed should not be raised")
+
+    urls = []
+
+    def fake_post(url, json=None, timeout=None):
+        urls.append(url)
+        return NotFound() if url.endswith("/api/embed") else _make_embed_response([0.5, 0.5])
+
+    monkeypatch.setattr("classify_embeddings._SESSION.post", fake_post)
+
+    vecs = get_embeddings_batch(["a"], "nomic-embed-text", "http://host:11434")
+    assert vecs.tolist() == [[0.5, 0.5]]
+    assert urls == ["http://host:11434/api/embed", "http://host:11434/api/embeddings"]
+
+
+def test_classify_posts_embedding_reuses_disk_cache(monkeypatch, tmp_path):
+    """A second run over the same texts should be served entirely from the cache."""
+    monkeypatch.setenv("OLLAMA_EMBED_CACHE", str(tmp_path / "cache.sqlite"))
+    calls = [0]
+
+    def counting_post(*a, **kw):
+        calls[0] += 1
+        return _make_embed_response([1.0, 0.0, 0.0])
+
+    monkeypatch.setattr("classify_embeddings._SESSION.post", counting_post)
+
+    classify_posts_embedding([{"text": "Cached post"}])
+    first_run_calls = calls[0]
+    assert first_run_calls > 0
+
+    posts = [{"text": "Cached post"}]
+    assert classify_posts_embedding(posts) == 1
+    assert calls[0] == first_run_calls
+    assert posts[0].get("category") in CATEGORIES
+
+
+def test_category_anchors_served_from_disk_cache_on_later_runs(monkeypatch, tmp_path):
+    """After the first run, category descriptions must never be re-sent to Ollama."""
+    monkeypatch.setenv("OLLAMA_EMBED_CACHE", str(tmp_path / "cache.sqlite"))
+    sent_texts = []
+
+    def recording_post(url, json=None, timeout=None):
+        sent_texts.extend(json.get("input") or [json.get("prompt")])
+        return _make_batch_response([[1.0, 0.0, 0.0]] * len(json.get("input") or [0]))
+
+    monkeypatch.setattr("classify_embeddings._SESSION.post", recording_post)
+
+    classify_posts_embedding([{"text": "First day's post"}])
+    sent_texts.clear()
+
+    assert classify_posts_embedding([{"text": "A brand new post"}]) == 1
+    assert sent_texts == ["A brand new post"]
+    assert not set(sent_texts) & set(CATEGORY_DESCRIPTIONS.values())
+
+
+def test_embed_cache_evicts_least_recently_used_rows(monkeypatch, tmp_path):
+    """Beyond _EMBED_CACHE_MAX_ROWS the oldest vectors are dropped and re-embedded on demand."""
+    monkeypatch.setenv("OLLAMA_EMBED_CACHE", str(tmp_path / "cache.sqlite"))
+    monkeypatch.setattr("classify_embeddings._EMBED_CACHE_MAX_ROWS", 2)
+    sent_texts = []
+
+    def recording_post(url, json=None, timeout=None):
+        sent_texts.extend(json["input"])
+        return _make_batch_response([[1.0, 0.0]] * len(json["input"]))
+
+    monkeypatch.setattr("classify_embeddings._SESSION.post", recording_post)
+
+    for text in ["old", "newer", "newest"]:
+        _embed_texts([text], "m", "http://host:11434")
+    sent_texts.clear()
+
+    _embed_texts(["newest", "newer", "old"], "m", "http://host:11434")
+    assert sent_texts == ["old"]
+
+
+def test_cached_vectors_of_another_size_are_re_embedded(monkeypatch, tmp_path):
+    """After the model changes size, stale cached anchors and posts must not be mixed with fresh ones."""
+    monkeypatch.setenv("OLLAMA_EMBED_CACHE", str(tmp_path / "cache.sqlite"))
+    size = [3]
+
+    def sized_post(url, json=None, timeout=None):
+        return _make_batch_response([[1.0] + [0.0] * (size[0] - 1)] * len(json["input"]))
+
+    monkeypatch.setattr("classify_embeddings._SESSION.post", sized_post)
+    classify_posts_embedding([{"text": "Seen yesterday"}])
+
+    size[0] = 4
+    posts = [{"text": "Seen yesterday"}, {"text": "New today"}]
+    assert classify_posts_embedding(posts) == 2
+    assert all(p.get("category") in CATEGORIES for p in posts)
+
+
 def test_category_descriptions_cover_all_categories():
     """Every CATEGORY must have a rich description defined."""
     for cat in CATEGORIES:
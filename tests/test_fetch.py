@@ -6,7 +6,7 @@ backward-compatible fetch_timeline module wrapper.
 
 import pytest
 from unittest.mock import MagicMock
-from fetchers.x_fetcher import XFetcher
+from fetchers.x_fetcher import XFetcher, _build_client, _orjson_client_class
 
 
 def _make_fetcher() -> XFetcher:
@@ -18,22 +18,17 @@ def test_fetch_posts_with_limit(mocker):
     fetcher = _make_fetcher()
     mock_client = MagicMock()
 
-    mock_tweet = MagicMock()
-    mock_tweet.id = 123
-    mock_tweet.text = "Mock post"
-    mock_tweet.created_at = "2026-02-20T10:00:00Z"
-    mock_tweet.author_id = 456
-    mock_tweet.public_metrics = {"like_count": 10, "retweet_count": 2, "reply_count": 1}
-
-    mock_user = MagicMock()
-    mock_user.id = 456
-    mock_user.name = "Tester"
-    mock_user.username = "test_user"
-
-    mock_response = MagicMock()
-    mock_response.data = [mock_tweet]
-    mock_response.includes = {"users": [mock_user]}
-    mock_response.meta = {"next_token": None}
+    mock_response = {
+        "data": [{
+            "id": "123",
+            "text": "Mock post",
+            "created_at": "2026-02-20T10:00:00.000Z",
+            "author_id": "456",
+            "public_metrics": {"like_count": 10, "retweet_count": 2, "reply_count": 1},
+        }],
+        "includes": {"users": [{"id": "456", "name": "Tester", "username": "test_user"}]},
+        "meta": {"result_count": 1},
+    }
 
     mock_client.get_home_timeline.return_value = mock_response
 
@@ -42,10 +37,16 @@ def test_fetch_posts_with_limit(mocker):
     assert len(posts) == 1
     assert posts[0]["author_username"] == "test_user"
     assert posts[0]["text"] == "Mock post"
+    assert posts[0]["id"] == 123
+    assert posts[0]["likes"] == 10
+    assert posts[0]["created_at"].isoformat() == "2026-02-20T10:00:00+00:00"
+    assert posts[0]["url"] == "https://x.com/test_user/status/123"
 
     mock_client.get_home_timeline.assert_called_once()
     _, kwargs = mock_client.get_home_timeline.call_args
     assert kwargs["max_results"] == 1
+    # Only the fields _parse_tweets reads are requested (no heavy "entities" payload)
+    assert kwargs["tweet_fields"] == ["created_at", "public_metrics", "author_id", "text"]
 
 
 def test_fetch_posts_pagination(mocker):
@@ -53,16 +54,84 @@ def test_fetch_posts_pagination(mocker):
     fetcher = _make_fetcher()
     mock_client = MagicMock()
 
-    mock_tweet1 = MagicMock(id=1, text="T1", author_id=456, public_metrics={}, created_at="2026-02-20T09:00:00Z")
-    mock_response1 = MagicMock(data=[mock_tweet1], includes={"users": []}, meta={"next_token": "token2"})
+    tweet1 = {"id": "1", "text": "T1", "author_id": "456", "public_metrics": {}, "created_at": "2026-02-20T09:00:00.000Z"}
+    mock_response1 = {"data": [tweet1], "meta": {"next_token": "token2"}}
 
-    mock_tweet2 = MagicMock(id=2, text="T2", author_id=456, public_metrics={}, created_at="2026-02-20T08:00:00Z")
-    mock_response2 = MagicMock(data=[mock_tweet2], includes={"users": []}, meta={"next_token": None})
+    tweet2 = {"id": "2", "text": "T2", "author_id": "456", "public_metrics": {}, "created_at": "2026-02-20T08:00:00.000Z"}
+    mock_response2 = {"data": [tweet2], "meta": {}}
 
     mock_client.get_home_timeline.side_effect = [mock_response1, mock_response2]
+    mock_sleep = mocker.patch("fetchers.x_fetcher.time.sleep")
 
     posts = fetcher._fetch_timeline(mock_client, limit=2)
 
     assert len(posts) == 2
     assert mock_client.get_home_timeline.call_count == 2
+    assert posts[0]["author_username"] == "unknown"
+    # The second page waits out the minimum request spacing; the first is sent immediately
+    mock_sleep.assert_called_once()
+    assert 0 < mock_sleep.call_args.args[0] <= 1.0
+
+
+def test_fetch_timeline_requests_next_page_before_parsing(mocker):
+    """The next page is requested while the current one is still being parsed."""
+    import threading
+
+    fetcher = _make_fetcher()
+    mock_client = MagicMock()
+    tweet = {"id": "1", "text": "T1", "author_id": "456", "public_metrics": {}, "created_at": "2026-02-20T09:00:00.000Z"}
+    pages = iter([
+        {"data": [tweet], "meta": {"next_token": "token2"}},
+        {"data": [dict(tweet, id="2")], "meta": {}},
+    ])
+    page2_requested = threading.Event()
+
+    def get_home_timeline(**kwargs):
+        if kwargs["pagination_token"] == "token2":
+            page2_requested.set()
+        return next(pages)
+
+    mock_client.get_home_timeline.side_effect = get_home_timeline
+    mocker.patch("fetchers.x_fetcher.time.sleep")
+
+    requested_during_parse = []
+    original_parse = fetcher._parse_tweets
+
+    def parse_spy(tweets, authors):
+        if not requested_during_parse:
+            requested_during_parse.append(page2_requested.wait(timeout=5))
+        return original_parse(tweets, authors)
+
+    mocker.patch.object(fetcher, "_parse_tweets", side_effect=parse_spy)
+    posts = fetcher._fetch_timeline(mock_client, limit=5)
+
+    assert len(posts) == 2
+    assert requested_during_parse == [True]
+    # The prefetched page only asks for what the limit still allows
+    assert mock_client.get_home_timeline.call_args_list[1].kwargs["max_results"] == 4
+
+
+def test_orjson_client_decodes_response_body(mocker):
+    """The tweepy Client subclass should decode response bodies with orjson."""
+    import tweepy
+
+    raw_response = MagicMock(content=b'{"data": [{"id": "1", "text": "hi"}], "meta": {}}')
+    mocker.patch.object(tweepy.Client, "request", return_value=raw_response)
+
+    client = _orjson_client_class()(bearer_token="DUMMY_TOKEN")
+    assert isinstance(client, tweepy.Client)
+    response = client.request("GET", "/2/users/1/timelines/reverse_chronological")
+    assert response.json() == {"data": [{"id": "1", "text": "hi"}], "meta": {}}
+
+
+def test_get_client_returns_raw_dicts(monkeypatch):
+    """The client should skip tweepy's model layer and return decoded JSON dicts."""
+    _build_client.cache_clear()
+    for key in ("X_API_KEY", "X_API_SECRET", "X_ACCESS_TOKEN", "X_ACCESS_TOKEN_SECRET", "X_BEARER_TOKEN"):
+        monkeypatch.setenv(key, "DUMMY")
 
+    client = XFetcher()._get_client()
+    assert client.return_type is dict
+    # Same credentials in the same process: the client (and its keep-alive session) is reused
+    assert XFetcher()._get_client() is client
+    _build_client.cache_clear()
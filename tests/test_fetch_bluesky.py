@@ -5,10 +5,11 @@ Tests for BlueskyFetcher (via fetchers.bluesky_fetcher).
 
 import pytest
 import os
+from types import SimpleNamespace
 from datetime import datetime, timezone
 from unittest.mock import patch, MagicMock
 
-from fetchers.bluesky_fetcher import BlueskyFetcher
+from fetchers.bluesky_fetcher import BlueskyFetcher, _parse_timestamps, _cutoff_index, _login
 from scoring import add_z_scores
 
 
@@ -35,13 +36,27 @@ def test_is_configured_false():
 # ------------------------------------------------------------------
 
 def test_get_client_success():
+    _login.cache_clear()
     with patch.dict(os.environ, {"BSKY_HANDLE": "user.bsky.social", "BSKY_APP_PASSWORD": "DUMMY_BSKY_PASSWORD"}):
-        with patch("fetchers.bluesky_fetcher.Client") as mock_client_cls:
+        with patch("atproto.Client") as mock_client_cls:
             mock_client = MagicMock()
             mock_client_cls.return_value = mock_client
             client = _make_fetcher()._get_client()
             assert client == mock_client
             mock_client.login.assert_called_once_with("user.bsky.social", "DUMMY_BSKY_PASSWORD")
+    _login.cache_clear()
+
+
+def test_get_client_reuses_logged_in_client():
+    _login.cache_clear()
+    with patch.dict(os.environ, {"BSKY_HANDLE": "user.bsky.social", "BSKY_APP_PASSWORD": "DUMMY_BSKY_PASSWORD"}):
+        with patch("atproto.Client") as mock_client_cls:
+            first = _make_fetcher()._get_client()
+            second = _make_fetcher()._get_client()
+    _login.cache_clear()
+
+    assert first is second
+    mock_client_cls.return_value.login.assert_called_once()
 
 
 def test_get_client_missing_env():
@@ -86,6 +101,64 @@ def test_parse_posts():
     assert post["created_at"] == datetime(2023, 10, 1, 12, 0, tzinfo=timezone.utc)
 
 
+def test_parse_posts_drops_posts_before_cutoff():
+    views = []
+    for i, created_at in enumerate(["2023-10-01T13:00:00Z", "2023-10-01T11:00:00Z"]):
+        view = MagicMock()
+        view.post.uri = f"at://did:plc:123/app.bsky.feed.post/{i}"
+        view.post.record.created_at = created_at
+        views.append(view)
+
+    cutoff = datetime(2023, 10, 1, 12, 0, tzinfo=timezone.utc)
+    posts = _make_fetcher()._parse_posts(views, cutoff)
+
+    assert [p["id"] for p in posts] == ["at://did:plc:123/app.bsky.feed.post/0"]
+
+
+def test_parse_posts_deduplicates_reposted_uris():
+    original = MagicMock()
+    original.post.uri = "at://did:plc:123/app.bsky.feed.post/1"
+    original.post.record.created_at = "2023-10-01T13:00:00Z"
+    other = MagicMock()
+    other.post.uri = "at://did:plc:123/app.bsky.feed.post/2"
+    other.post.record.created_at = "2023-10-01T12:30:00Z"
+
+    posts = _make_fetcher()._parse_posts([original, other, original])
+
+    assert [p["id"] for p in posts] == [
+        "at://did:plc:123/app.bsky.feed.post/1",
+        "at://did:plc:123/app.bsky.feed.post/2",
+    ]
+    assert posts[0]["created_at"] == datetime(2023, 10, 1, 13, 0, tzinfo=timezone.utc)
+
+
+def test_parse_timestamps_falls_back_to_now_for_bad_values():
+    before = datetime.now(timezone.utc)
+    parsed = _parse_timestamps(["2023-10-01T12:00:00Z", "not a date", None])
+    assert parsed[0] == datetime(2023, 10, 1, 12, 0, tzinfo=timezone.utc)
+    assert parsed[1] >= before
+    assert parsed[2] == parsed[1]
+
+
+def _feed_item(indexed_at: str, repost_at: str | None = None):
+    reason = SimpleNamespace(indexed_at=repost_at) if repost_at else None
+    return SimpleNamespace(post=SimpleNamespace(indexed_at=indexed_at), reason=reason)
+
+
+def test_cutoff_index_finds_first_item_before_cutoff():
+    cutoff = datetime(2023, 10, 1, 12, 0, tzinfo=timezone.utc)
+    page = [
+        _feed_item("2023-10-01T14:00:00Z"),
+        # Repost of an old post: positioned by the repost time, not the original post
+        _feed_item("2023-09-01T00:00:00Z", repost_at="2023-10-01T13:00:00Z"),
+        _feed_item("2023-10-01T12:30:00Z"),
+        _feed_item("2023-10-01T11:00:00Z"),
+        _feed_item("2023-10-01T10:00:00Z"),
+    ]
+    assert _cutoff_index(page, cutoff) == 3
+    assert _cutoff_index(page[:3], cutoff) == 3
+
+
 # ------------------------------------------------------------------
 # add_z_scores (scoring utility — unchanged)
 # ------------------------------------------------------------------
@@ -131,3 +204,20 @@ def test_fetch_posts(mock_get_client):
     mock_client.app.bsky.feed.get_timeline.assert_called_once()
 
 
+def test_iter_feeds_stops_on_boundary_page():
+    """Paging stops once a page ends before the cutoff, and only that page's tail is dropped."""
+    cutoff = datetime(2023, 10, 1, 12, 0, tzinfo=timezone.utc)
+    page1 = [_feed_item("2023-10-01T15:00:00Z"), _feed_item("2023-10-01T14:00:00Z")]
+    page2 = [_feed_item("2023-10-01T13:00:00Z"), _feed_item("2023-10-01T11:00:00Z")]
+
+    mock_client = MagicMock()
+    mock_client.app.bsky.feed.get_timeline.side_effect = [
+        SimpleNamespace(feed=page1, cursor="c1"),
+        SimpleNamespace(feed=page2, cursor="c2"),
+    ]
+
+    feed_views = list(_make_fetcher()._iter_feeds(mock_client, cutoff, limit=None))
+
+    assert feed_views == page1 + page2[:1]
+    assert mock_client.app.bsky.feed.get_timeline.call_count == 2
+
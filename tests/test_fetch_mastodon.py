@@ -8,7 +8,7 @@ import os
 from datetime import datetime, timezone
 from unittest.mock import patch, MagicMock
 
-from fetchers.mastodon_fetcher import MastodonFetcher
+from fetchers.mastodon_fetcher import MastodonFetcher, _html_to_text, _build_client
 from scoring import add_z_scores
 
 
@@ -41,13 +41,14 @@ def test_is_configured_false():
 # ------------------------------------------------------------------
 
 def test_get_client_success():
+    _build_client.cache_clear()
     with patch.dict(os.environ, {
         "MASTODON_CLIENT_ID": "dummy_client_id",
         "MASTODON_CLIENT_SECRET": "dummy_secret",
         "MASTODON_ACCESS_TOKEN": "dummy_token",
         "MASTODON_API_BASE_URL": "https://mastodon.social"
     }):
-        with patch("fetchers.mastodon_fetcher.Mastodon") as mock_client_cls:
+        with patch("mastodon.Mastodon") as mock_client_cls:
             mock_client = MagicMock()
             mock_client_cls.return_value = mock_client
             client = _make_fetcher()._get_client()
@@ -58,6 +59,7 @@ def test_get_client_success():
                 access_token="dummy_token",
                 api_base_url="https://mastodon.social",
             )
+    _build_client.cache_clear()
 
 
 def test_get_client_missing_env():
@@ -104,6 +106,31 @@ def test_parse_posts():
     assert post["created_at"] == datetime(2023, 10, 1, 12, 0, tzinfo=timezone.utc)
 
 
+def test_parse_posts_decodes_entities_and_paragraphs():
+    mock_toot = MagicMock()
+    mock_toot.id = 1
+    mock_toot.favourites_count = 0
+    mock_toot.reblogs_count = 0
+    mock_toot.replies_count = 0
+    mock_toot.account.display_name = "User"
+    mock_toot.account.acct = "user"
+    mock_toot.content = "<p>Q&amp;A today</p><p>It&#39;s live<br />now</p>"
+    mock_toot.created_at = datetime(2023, 10, 1, 12, 0, tzinfo=timezone.utc)
+    mock_toot.url = "https://mastodon.social/@user/1"
+
+    posts = _make_fetcher()._parse_posts([mock_toot])
+    assert posts[0]["text"] == "Q&A today\nIt's live\nnow"
+
+
+def test_html_to_text_strips_tags_with_attributes():
+    content = (
+        '<p>See <a href="https://example.com/a?b=1" rel="nofollow noopener" target="_blank">'
+        '<span class="invisible">https://</span>example.com</a> &lt;3 '
+        '<a href="https://mastodon.social/tags/python" class="mention hashtag">#<span>python</span></a></p>'
+    )
+    assert _html_to_text(content) == "See https://example.com <3 #python"
+
+
 # ------------------------------------------------------------------
 # fetch_posts
 # ------------------------------------------------------------------
@@ -166,3 +193,18 @@ def test_fetch_posts_with_time_window(mock_get_client):
     assert posts[0]["text"] == "Inside"
 
 
+def test_iter_toots_prefetches_only_while_inside_window():
+    """The next batch is requested only while the current one is fully inside the window."""
+    cutoff = datetime(2023, 10, 1, 12, 0, tzinfo=timezone.utc)
+    batch1 = [MagicMock(created_at=datetime(2023, 10, 1, hour, 0, tzinfo=timezone.utc)) for hour in (15, 14)]
+    batch2 = [MagicMock(created_at=datetime(2023, 10, 1, hour, 0, tzinfo=timezone.utc)) for hour in (13, 11)]
+
+    mock_client = MagicMock()
+    mock_client.timeline_home.return_value = batch1
+    mock_client.fetch_next.return_value = batch2
+
+    toots = list(_make_fetcher()._iter_toots(mock_client, cutoff, limit=None))
+
+    assert toots == batch1 + batch2[:1]
+    mock_client.fetch_next.assert_called_once_with(batch1)
+
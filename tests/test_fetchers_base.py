@@ -4,7 +4,9 @@ Tests for the BasePlatformFetcher ABC contract.
 """
 
 import pytest
-from fetchers.base import BasePlatformFetcher
+from datetime import datetime, timezone
+
+from fetchers.base import BasePlatformFetcher, parse_iso_datetime
 
 
 def test_cannot_instantiate_base_directly():
@@ -49,3 +51,11 @@ def test_concrete_subclass_works():
     assert fetcher.is_configured() is True
     assert fetcher.fetch_posts() == []
     assert fetcher.platform_name == "dummy"
+
+
+def test_parse_iso_datetime_handles_z_suffix_and_fractions():
+    """API timestamps with a trailing Z parse to timezone-aware UTC datetimes."""
+    assert parse_iso_datetime("2026-02-20T10:00:00.000Z") == datetime(2026, 2, 20, 10, 0, tzinfo=timezone.utc)
+    assert parse_iso_datetime("2026-02-20T10:00:00.250000+00:00").microsecond == 250000
+    with pytest.raises(ValueError):
+        parse_iso_datetime("not a timestamp")
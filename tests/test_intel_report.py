@@ -6,12 +6,13 @@ from unittest.mock import patch, MagicMock
 # Ensure the project root is on sys.path
 sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
 
-from intel_report import generate_intel_report_local
+from intel_report import generate_intel_report_local, SUMMARY_MAX_TOKENS
 
+@patch("intel_report._warm_ollama")
 @patch("intel_report.generate_section")
 @patch("intel_report._generate_ollama")
 @patch("classify_embeddings.classify_posts_embedding")
-def test_generate_intel_report_local(mock_classify_embedding, mock_generate_ollama, mock_generate_section):
+def test_generate_intel_report_local(mock_classify_embedding, mock_generate_ollama, mock_generate_section, mock_warm_ollama):
     """Test the full local Map-Reduce pipeline, including the Executive Summary pass."""
 
     # Mock input with two posts
@@ -46,6 +47,7 @@ def test_generate_intel_report_local(mock_classify_embedding, mock_generate_olla
 
     # Did it make exactly one call to the LLM (for the executive summary)?
     mock_generate_ollama.assert_called_once()
+    assert mock_generate_ollama.call_args.kwargs["max_tokens"] == SUMMARY_MAX_TOKENS
 
     # Does the final report contain the assembled parts?
     assert "# Global Situation Report:" in result
@@ -53,3 +55,299 @@ def test_generate_intel_report_local(mock_classify_embedding, mock_generate_olla
     assert "**Executive Summary:**\nThis is the mock executive summary." in result
     assert "**Geopolitics & Security**\n- Mocked bullet for Geopolitics & Security (1 posts)" in result
     assert "**AI & Technology**\n- Mocked bullet for AI & Technology (1 posts)" in result
+
+
+@patch("intel_report._warm_ollama")
+@patch("intel_report.generate_section", return_value="**Section**")
+@patch("intel_report._generate_ollama", return_value="Summary")
+@patch("classify_embeddings.classify_posts_embedding", return_value=0)
+def test_generate_intel_report_local_classifies_only_top_engagement_budget(
+    mock_classify_embedding, mock_generate_ollama, mock_generate_section, mock_warm_ollama, monkeypatch
+):
+    monkeypatch.setenv("CLASSIFY_BUDGET", "2")
+    # Ranked by cross-platform z-score, not raw engagement
+    posts = [{"text": f"Post {i}", "engagement_score": 100 - i, "normalized_score": i} for i in range(5)]
+
+    generate_intel_report_local(posts)
+
+    classified = mock_classify_embedding.call_args.args[0]
+    assert [p["normalized_score"] for p in classified] == [4, 3]
+
+
+@patch("intel_report._warm_ollama")
+@patch("intel_report._generate_ollama", return_value="Summary")
+@patch("classify_embeddings.classify_posts_embedding")
+def test_generate_intel_report_local_keeps_quiet_post_in_sparse_category(
+    mock_classify_embedding, mock_generate_ollama, mock_warm_ollama, monkeypatch
+):
+    """By default every post is classified, so a low-engagement post still leads a sparse category."""
+    monkeypatch.delenv("CLASSIFY_BUDGET", raising=False)
+    posts = [{"text": f"Market post {i}", "engagement_score": 1000 + i, "normalized_score": 1.0} for i in range(600)]
+    posts.append({"text": "Quiet science post", "engagement_score": 1, "normalized_score": -2.0})
+
+    def fake_classify(post_list, ollama_url=None, embed_model=None):
+        for p in post_list:
+            p["category"] = "Health & Science" if p["text"].startswith("Quiet") else "Economics & Markets"
+        return len(post_list)
+    mock_classify_embedding.side_effect = fake_classify
+
+    sections = {}
+
+    def fake_section(cat, section_posts):
+        sections[cat] = section_posts
+        return f"**{cat}**"
+
+    with patch("intel_report.generate_section", side_effect=fake_section):
+        generate_intel_report_local(posts, top_per_category=10)
+
+    assert [p["text"] for p in sections["Health & Science"]] == ["Quiet science post"]
+
+
+class _StreamingResponse:
+    """Minimal stand-in for a streamed requests.Response (NDJSON lines)."""
+
+    def __init__(self, lines: list[bytes]):
+        self._lines = lines
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_lines(self):
+        return iter(self._lines)
+
+
+def test_generate_ollama_assembles_streamed_chunks(monkeypatch):
+    """_generate_ollama should stream over the shared session and join the response chunks."""
+    from intel_report import _generate_ollama
+
+    calls = []
+
+    def fake_post(url, headers=None, json=None, stream=False, timeout=None):
+        calls.append((url, json, stream))
+        return _StreamingResponse([
+            b'{"response": "Hello", "done": false}',
+            b'',
+            b'{"response": " world", "done": false}',
+            b'{"response": "", "done": true}',
+        ])
+
+    monkeypatch.setattr("intel_report._SESSION.post", fake_post)
+    monkeypatch.setenv("OLLAMA_URL", "http://host:11434/api/generate")
+    monkeypatch.setenv("OLLAMA_MODEL", "llama3.2")
+    for key in ("OLLAMA_KEEP_ALIVE", "OLLAMA_NUM_CTX", "OLLAMA_NUM_PREDICT", "OLLAMA_NUM_THREAD"):
+        monkeypatch.delenv(key, raising=False)
+
+    assert _generate_ollama("prompt") == "Hello world"
+    assert calls == [(
+        "http://host:11434/api/generate",
+        {
+            "model": "llama3.2",
+            "prompt": "prompt",
+            "stream": True,
+            "keep_alive": "30m",
+            "options": {"num_ctx": 4096, "num_predict": 512},
+        },
+        True,
+    )]
+
+
+def test_ollama_options_read_from_env(monkeypatch):
+    from intel_report import _ollama_options
+
+    monkeypatch.setenv("OLLAMA_NUM_CTX", "2048")
+    monkeypatch.setenv("OLLAMA_NUM_PREDICT", "256")
+    monkeypatch.setenv("OLLAMA_NUM_THREAD", "6")
+    assert _ollama_options() == {"num_ctx": 2048, "num_predict": 256, "num_thread": 6}
+
+
+def test_warm_ollama_loads_model_without_prompt(monkeypatch):
+    """The warm-up request carries no prompt, only the model, keep_alive and options."""
+    from intel_report import _warm_ollama
+
+    calls = []
+    monkeypatch.setattr("intel_report._SESSION.post", lambda url, json=None, timeout=None: calls.append((url, json)) or MagicMock())
+    monkeypatch.setenv("OLLAMA_URL", "http://host:11434/api/generate")
+    monkeypatch.setenv("OLLAMA_MODEL", "llama3.2")
+    monkeypatch.setenv("OLLAMA_KEEP_ALIVE", "1h")
+    monkeypatch.setenv("OLLAMA_NUM_CTX", "2048")
+    monkeypatch.delenv("OLLAMA_NUM_THREAD", raising=False)
+
+    _warm_ollama()
+
+    assert len(calls) == 1
+    url, body = calls[0]
+    assert url == "http://host:11434/api/generate"
+    assert "prompt" not in body
+    assert body["keep_alive"] == "1h"
+    # Same num_ctx as the real calls, otherwise Ollama would reload the model
+    assert body["options"]["num_ctx"] == 2048
+
+
+def test_warm_ollama_ignores_connection_errors(monkeypatch):
+    import requests
+    from intel_report import _warm_ollama
+
+    def refuse(*a, **kw):
+        raise requests.ConnectionError("refused")
+
+    monkeypatch.setattr("intel_report._SESSION.post", refuse)
+    _warm_ollama()
+
+
+def test_generate_ollama_raises_on_stream_error(monkeypatch):
+    from intel_report import _generate_ollama
+
+    monkeypatch.setattr(
+        "intel_report._SESSION.post",
+        lambda *a, **kw: _StreamingResponse([b'{"error": "model not found"}']),
+    )
+
+    with pytest.raises(RuntimeError, match="Ollama request failed: model not found"):
+        _generate_ollama("prompt")
+
+
+def test_generate_ollama_max_tokens_capped_by_num_predict(monkeypatch):
+    from intel_report import _generate_ollama
+
+    bodies = []
+
+    def fake_post(url, headers=None, json=None, stream=False, timeout=None):
+        bodies.append(json)
+        return _StreamingResponse([b'{"response": "ok", "done": true}'])
+
+    monkeypatch.setattr("intel_report._SESSION.post", fake_post)
+    monkeypatch.setenv("OLLAMA_NUM_PREDICT", "512")
+
+    _generate_ollama("prompt", max_tokens=16)
+    assert bodies[0]["options"]["num_predict"] == 16
+
+    # A lower OLLAMA_NUM_PREDICT caps the per-call budget
+    monkeypatch.setenv("OLLAMA_NUM_PREDICT", "8")
+    _generate_ollama("prompt", max_tokens=16)
+    assert bodies[1]["options"]["num_predict"] == 8
+
+
+def test_generate_llamacpp_posts_to_completion_endpoint(monkeypatch):
+    from intel_report import _generate_llamacpp
+
+    calls = []
+
+    def fake_post(url, json=None, timeout=None):
+        calls.append((url, json))
+        return MagicMock(content=b'{"content": "Drafted section", "stop": true}')
+
+    monkeypatch.setattr("intel_report._SESSION.post", fake_post)
+    monkeypatch.setenv("LLAMACPP_URL", "http://host:8080/completion")
+
+    assert _generate_llamacpp("prompt", max_tokens=400) == "Drafted section"
+    assert calls == [(
+        "http://host:8080/completion",
+        {"prompt": "prompt", "n_predict": 400, "stream": False, "cache_prompt": True},
+    )]
+
+    monkeypatch.setenv("LLAMACPP_N_PREDICT", "128")
+    _generate_llamacpp("prompt", max_tokens=400)
+    assert calls[1][1]["n_predict"] == 128
+
+
+@patch("intel_report._generate_ollama")
+@patch("intel_report._generate_llamacpp")
+def test_generate_local_dispatches_on_backend(mock_llamacpp, mock_ollama, monkeypatch):
+    from intel_report import _generate_local
+
+    monkeypatch.setenv("INTEL_BACKEND", "llamacpp")
+    _generate_local("prompt", max_tokens=10)
+    mock_llamacpp.assert_called_once_with("prompt", max_tokens=10)
+    mock_ollama.assert_not_called()
+
+    monkeypatch.setenv("INTEL_BACKEND", "ollama")
+    _generate_local("prompt")
+    mock_ollama.assert_called_once_with("prompt", max_tokens=None)
+
+
+@patch("intel_report.generate_section")
+def test_generate_sections_runs_concurrently_in_category_order(mock_generate_section):
+    """Sections should be drafted in parallel but returned in category order."""
+    import threading
+    from intel_report import _generate_sections
+
+    barrier = threading.Barrier(2, timeout=5)
+
+    def slow_section(cat, posts):
+        barrier.wait()  # BrokenBarrierError unless both sections are in flight together
+        return f"**{cat}**"
+
+    mock_generate_section.side_effect = slow_section
+    by_category = {"Geopolitics & Security": [{}], "AI & Technology": [{}]}
+
+    sections = _generate_sections(by_category)
+
+    assert sections == ["**Geopolitics & Security**", "**AI & Technology**"]
+
+
+@patch("intel_report.generate_section", return_value="**Section**")
+def test_generate_sections_works_inside_a_running_event_loop(mock_generate_section):
+    """Library code must not start its own event loop, so callers may already be in one."""
+    import asyncio
+    from intel_report import _generate_sections
+
+    async def caller():
+        return _generate_sections({"AI & Technology": [{}]})
+
+    assert asyncio.run(caller()) == ["**Section**"]
+
+
+@patch("intel_report._generate_ollama")
+def test_generate_section_strips_urls_and_repeated_header(mock_generate_ollama):
+    from intel_report import generate_section, SECTION_MAX_TOKENS
+
+    mock_generate_ollama.return_value = (
+        "AI & Technology\n"
+        "- New model released ( https://example.com/model )   \n"
+        "- See https://example.com for details"
+    )
+
+    section = generate_section("AI & Technology", [{"text": "New model", "platform": "x"}])
+
+    assert section == "**AI & Technology**\n- New model released\n- See  for details\n"
+    assert mock_generate_ollama.call_args.kwargs["max_tokens"] == SECTION_MAX_TOKENS
+
+
+def test_generate_gemini_reuses_client(monkeypatch):
+    """The Gemini client should be built once per API key and reused across calls."""
+    from intel_report import _generate_gemini, _get_gemini_client
+
+    _get_gemini_client.cache_clear()
+    monkeypatch.setenv("GEMINI_API_KEY", "DUMMY_KEY")
+    with patch("google.genai.Client") as mock_client_cls:
+        mock_client_cls.return_value.models.generate_content.return_value = MagicMock(text="Report")
+        assert _generate_gemini("prompt") == "Report"
+        assert _generate_gemini("prompt") == "Report"
+    _get_gemini_client.cache_clear()
+
+    mock_client_cls.assert_called_once_with(api_key="DUMMY_KEY")
+
+
+def test_gemini_generate_retries_only_rate_limit_errors(monkeypatch):
+    from google.genai import errors
+    from intel_report import _gemini_generate
+
+    sleeps = []
+    monkeypatch.setattr("intel_report.time.sleep", sleeps.append)
+    rate_limited = errors.ClientError(429, {"error": {"code": 429, "status": "RESOURCE_EXHAUSTED"}})
+    client = MagicMock()
+    client.models.generate_content.side_effect = [rate_limited, rate_limited, "response"]
+
+    assert _gemini_generate(client, "model", "prompt") == "response"
+    assert sleeps == [4, 8]
+
+    client.models.generate_content.side_effect = errors.ClientError(400, {"error": {"code": 400}})
+    with pytest.raises(errors.ClientError):
+        _gemini_generate(client, "model", "prompt")
+    assert sleeps == [4, 8]
@@ -10,6 +10,7 @@ import tempfile
 import textwrap
 import unittest.mock
 import pytest
+from datetime import datetime
 
 # Ensure the project root is on sys.path
 sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
@@ -17,6 +18,12 @@ sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
 from main import _ensure_utf8_stdout  # _ensure_utf8_stdout tests
 
 
+@pytest.fixture(autouse=True)
+def _no_intel_report_cache(monkeypatch):
+    """Disable the on-disk intel report cache so tests never reuse a report."""
+    monkeypatch.setenv("INTEL_REPORT_CACHE", "")
+
+
 def test_ensure_utf8_stdout_reconfigures_when_cp1252(monkeypatch):
     """On a cp1252 terminal, stdout should be reconfigured to UTF-8."""
     mock_stdout = unittest.mock.MagicMock()
@@ -58,7 +65,7 @@ def test_from_summary_missing_file_raises():
 # _load_env tests
 
 from main import _load_env, main
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, ANY
 
 
 def test_load_env_missing_file(capsys):
@@ -77,20 +84,22 @@ def test_load_env_missing_file(capsys):
 @patch("main.sys.argv", ["main.py", "--from-cache"])
 @patch("main.generate_intel_report")
 @patch("main.Path.exists")
-@patch("main.Path.open")
-@patch("main.json.load")
+@patch("main.Path.read_bytes")
 @patch("main.Path.read_text")
 @patch("main.Path.write_text")
-def test_main_from_cache_auto(mock_write_text, mock_read_text, mock_json_load, mock_open, mock_exists, mock_generate_intel, capsys):
+def test_main_from_cache_auto(mock_write_text, mock_read_text, mock_read_bytes, mock_exists, mock_generate_intel, capsys):
     """Test full main() flow using --from-cache (auto-detect file)"""
-    mock_exists.side_effect = [True, True, True]  # .env, .json, .md
-    mock_json_load.return_value = [{"text": "mock"}]
-    mock_read_text.return_value = "# Fake Summary"
+    mock_exists.side_effect = [True, True]  # .env, .json
+    mock_read_bytes.return_value = b'[{"text": "mock"}]'
     mock_generate_intel.return_value = "# Fake Intel Report"
 
     main()
 
-    mock_generate_intel.assert_called_once_with([{"text": "mock"}])
+    mock_generate_intel.assert_called_once_with([{"text": "mock"}], ANY)
+    # The run's timestamp is forwarded so the report is dated once, consistently
+    assert isinstance(mock_generate_intel.call_args.args[1], datetime)
+    # The companion markdown summary is not read back: the report works from the posts
+    mock_read_text.assert_not_called()
     assert mock_write_text.call_count == 1
 
     captured = capsys.readouterr()
@@ -108,10 +117,11 @@ def test_main_from_cache_auto(mock_write_text, mock_read_text, mock_json_load, m
 @patch("fetchers.x_fetcher.XFetcher.fetch_posts")
 @patch("fetchers.x_fetcher.XFetcher.is_configured")
 @patch("main._load_env")
+@patch("main.Path.write_bytes")
 @patch("main.Path.exists")
 @patch("main.Path.write_text")
 def test_main_fetch_all_sources(
-    mock_write_text, mock_exists, mock_load_env,
+    mock_write_text, mock_exists, mock_write_bytes, mock_load_env,
     mock_x_configured, mock_x_fetch,
     mock_bsky_configured, mock_bsky_fetch,
     mock_mastodon_configured, mock_mastodon_fetch,
@@ -140,10 +150,12 @@ def test_main_fetch_all_sources(
         {"text": "Hello", "platform": "x", "author_username": "user", "engagement_score": 10},
         {"text": "Hello Bsky", "platform": "bluesky", "author_username": "user", "engagement_score": 5},
         {"text": "Hello Mastodon", "platform": "mastodon", "author_username": "user", "engagement_score": 2}
-    ])
+    ], ANY)
 
-    # Write summary markdown, write JSON cache, write intel report
-    assert mock_write_text.call_count == 3
+    # Write summary markdown and intel report as text, the JSON cache as compact bytes
+    assert mock_write_text.call_count == 2
+    mock_write_bytes.assert_called_once()
+    assert b'{"text":"Hello Bsky","platform":"bluesky"' in mock_write_bytes.call_args.args[0]
 
     captured = capsys.readouterr()
     assert "[done] Summary saved \u2192" in captured.out
@@ -157,10 +169,11 @@ def test_main_fetch_all_sources(
 @patch("fetchers.bluesky_fetcher.BlueskyFetcher.is_configured")
 @patch("fetchers.x_fetcher.XFetcher.is_configured")
 @patch("main._load_env")
+@patch("main.Path.write_bytes")
 @patch("main.Path.exists")
 @patch("main.Path.write_text")
 def test_main_fetch_bluesky_only(
-    mock_write_text, mock_exists, mock_load_env,
+    mock_write_text, mock_exists, mock_write_bytes, mock_load_env,
     mock_x_configured,
     mock_bsky_configured, mock_bsky_fetch,
     mock_build, mock_generate, capsys
@@ -177,7 +190,44 @@ def test_main_fetch_bluesky_only(
         main()
 
     mock_bsky_fetch.assert_called_once()
-    mock_generate.assert_called_once_with([{"text": "Hello Bsky", "platform": "bluesky", "author_username": "user", "engagement_score": 5}])
+    mock_generate.assert_called_once_with([{"text": "Hello Bsky", "platform": "bluesky", "author_username": "user", "engagement_score": 5}], ANY)
+
+
+@patch("main.sys.argv", ["main.py", "--source", "bluesky", "--no-summary-md"])
+@patch("main.generate_intel_report", return_value="# Intel Report")
+@patch("main.build_markdown")
+@patch("fetchers.bluesky_fetcher.BlueskyFetcher.fetch_posts")
+@patch("fetchers.bluesky_fetcher.BlueskyFetcher.is_configured", return_value=True)
+@patch("main._load_env")
+@patch("main.Path.write_bytes")
+@patch("main.Path.write_text")
+def test_main_no_summary_md_skips_markdown(
+    mock_write_text, mock_write_bytes, mock_load_env,
+    mock_bsky_configured, mock_bsky_fetch, mock_build, mock_generate, capsys
+):
+    """--no-summary-md skips build_markdown but still saves the JSON cache."""
+    mock_bsky_fetch.return_value = [{"text": "Hello Bsky", "platform": "bluesky", "author_username": "user", "engagement_score": 5}]
+
+    with patch.dict(os.environ, {"INTEL_BACKEND": "gemini", "GEMINI_MODEL": "gemini-flash-latest"}):
+        main()
+
+    mock_build.assert_not_called()
+    mock_write_bytes.assert_called_once()
+    # Only the intel report is written as text
+    assert mock_write_text.call_count == 1
+    assert "[done] Summary saved" not in capsys.readouterr().out
+
+
+@patch("main.sys.argv", ["main.py", "--from-cache", "--no-cache"])
+@patch("main.generate_intel_report")
+@patch("main._load_existing_cache", return_value=[{"text": "mock"}])
+@patch("main.Path.write_text")
+def test_main_no_cache_disables_embedding_cache(mock_write_text, mock_load_cache, mock_generate_intel):
+    mock_generate_intel.return_value = "# Fake Intel Report"
+    with patch.dict(os.environ, {"OLLAMA_EMBED_CACHE": "embed_cache.sqlite"}):
+        main()
+        assert os.environ["OLLAMA_EMBED_CACHE"] == ""
+        assert os.environ["INTEL_REPORT_CACHE"] == ""
 
 
 @patch("main.sys.argv", ["main.py", "--from-cache"])
@@ -193,3 +243,89 @@ def test_main_from_cache_missing_file_exits(mock_exists, capsys):
 
     captured = capsys.readouterr()
     assert "[error] JSON cache file not found:" in captured.out
+
+
+def test_fetch_all_runs_sources_concurrently():
+    """_fetch_all should overlap blocking fetches and keep results in fetcher order."""
+    import asyncio
+    import threading
+    from main import _fetch_all
+
+    barrier = threading.Barrier(2, timeout=5)
+
+    def make_fetcher(name):
+        fetcher = MagicMock()
+
+        def fetch_posts(hours, limit):
+            barrier.wait()  # Deadlocks (BrokenBarrierError) unless both run at once
+            return [{"text": name}]
+
+        fetcher.fetch_posts.side_effect = fetch_posts
+        return fetcher
+
+    posts = asyncio.run(_fetch_all([make_fetcher("x"), make_fetcher("bluesky")], limit=5))
+
+    assert posts == [{"text": "x"}, {"text": "bluesky"}]
+
+
+# intel report cache tests
+
+@patch("main.generate_intel_report", return_value="# Report")
+def test_intel_report_reused_for_identical_input(mock_generate, tmp_path, monkeypatch):
+    from main import _generate_and_save_intel_report
+
+    monkeypatch.setenv("INTEL_REPORT_CACHE", str(tmp_path / "cache"))
+    monkeypatch.setenv("INTEL_BACKEND", "gemini")
+    now = datetime(2026, 3, 1)
+    posts = [{"id": 1, "engagement_score": 10}]
+
+    _generate_and_save_intel_report(posts, now, tmp_path, intel_limit=0)
+    _generate_and_save_intel_report([dict(p) for p in posts], now, tmp_path, intel_limit=0)
+    assert mock_generate.call_count == 1
+    assert (tmp_path / "intel_report_2026-03-01.md").read_text(encoding="utf-8") == "# Report"
+
+    # Changed engagement means changed input: the report is regenerated
+    _generate_and_save_intel_report([{"id": 1, "engagement_score": 11}], now, tmp_path, intel_limit=0)
+    assert mock_generate.call_count == 2
+
+
+@patch("main.generate_intel_report", return_value="# Report")
+def test_intel_report_cache_misses_after_prompt_or_setting_change(mock_generate, tmp_path, monkeypatch):
+    from main import _generate_and_save_intel_report
+
+    monkeypatch.setenv("INTEL_REPORT_CACHE", str(tmp_path / "cache"))
+    monkeypatch.setenv("INTEL_BACKEND", "ollama")
+    now = datetime(2026, 3, 1)
+    posts = [{"id": 1, "engagement_score": 10}]
+
+    _generate_and_save_intel_report(posts, now, tmp_path, intel_limit=0)
+    monkeypatch.setattr("main.SECTION_PROMPT", "Edited prompt: {category}\n{posts}")
+    _generate_and_save_intel_report(posts, now, tmp_path, intel_limit=0)
+    assert mock_generate.call_count == 2
+
+    monkeypatch.setenv("CLASSIFY_BUDGET", "50")
+    _generate_and_save_intel_report(posts, now, tmp_path, intel_limit=0)
+    assert mock_generate.call_count == 3
+
+
+@patch("main.generate_intel_report", return_value="# Report")
+def test_intel_report_cache_off_by_default(mock_generate, tmp_path, monkeypatch):
+    from main import _generate_and_save_intel_report
+
+    monkeypatch.delenv("INTEL_REPORT_CACHE")
+    posts = [{"id": 1, "engagement_score": 10}]
+    for _ in range(2):
+        _generate_and_save_intel_report(posts, datetime(2026, 3, 1), tmp_path, intel_limit=0)
+    assert mock_generate.call_count == 2
+
+
+def test_intel_cache_keeps_only_newest_entries(tmp_path, monkeypatch):
+    from main import _store_intel_cache
+
+    monkeypatch.setattr("main._INTEL_CACHE_MAX_ENTRIES", 2)
+    for i in range(3):
+        path = tmp_path / f"{i}.md"
+        _store_intel_cache(path, "report")
+        os.utime(path, (i, i))
+
+    assert sorted(p.name for p in tmp_path.glob("*.md")) == ["1.md", "2.md"]
@@ -0,0 +1,43 @@
+"""
+tests/test_run_daily.py
+Tests for run_daily.py: in-process execution and the --isolated fallback.
+"""
+
+import pathlib
+import sys
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+# Ensure the project root is on sys.path
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
+
+import run_daily
+
+
+@pytest.mark.parametrize("code, expected", [(None, 0), (0, 0), (1, 1), ("boom", 1)])
+def test_run_in_process_maps_system_exit(code, expected):
+    with patch("main.main", side_effect=SystemExit(code)):
+        assert run_daily._run_in_process() == expected
+
+
+def test_run_in_process_restores_argv():
+    saved = list(sys.argv)
+    with patch("main.main") as mock_main:
+        assert run_daily._run_in_process() == 0
+    mock_main.assert_called_once()
+    assert sys.argv == saved
+
+
+def test_main_uses_subprocess_only_when_isolated():
+    with patch.object(sys, "argv", ["run_daily.py"]), \
+         patch("run_daily._run_in_process", return_value=0) as in_proc, \
+         patch("run_daily.subprocess.run") as mock_run:
+        run_daily.main()
+    in_proc.assert_called_once()
+    mock_run.assert_not_called()
+
+    with patch.object(sys, "argv", ["run_daily.py", "--isolated"]), \
+         patch("run_daily.subprocess.run", return_value=MagicMock(returncode=0)) as mock_run:
+        run_daily.main()
+    mock_run.assert_called_once()